@@ -10,8 +10,16 @@ Created on Sat Apr 17 13:17:33 2021
 import numpy as np
 import matplotlib.pyplot as plt
 from astar_function_py3 import astar
+import os
+import sys
 import time
 import pylab as pl # Needed for plotting numbers on plots
+
+# the 2-opt/Or-opt local search lives with the search algorithms
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "SearchAlgorithms")
+)
+from LocalSearch import LocalSearch
 #%matplotlib inline
 #%config InlineBackend.figure_format = 'svg'
 plt.style.use("seaborn")
@@ -75,7 +83,7 @@ adjacency_mat = cost_matrix
 
 class Population():
     def __init__(self, bag, adjacency_mat):
-        self.bag = bag
+        self.bag = np.asarray(bag)  # one chromosome per row
         self.parents = []
         self.score = 0
         self.best = None
@@ -89,22 +97,17 @@ def init_population(cities, adjacency_mat, n_population):
 
 pop = init_population(cities, adjacency_mat, 5)
 
-def fitness(self, chromosome):
-    return sum(
-        [
-            self.adjacency_mat[chromosome[i], chromosome[i + 1]]
-            for i in range(len(chromosome) - 1)
-        ]
-    )
+def fitness(self, bag):
+    # every leg of every chromosome in one fancy index
+    bag = np.atleast_2d(bag)
+    return self.adjacency_mat[bag[:, :-1], bag[:, 1:]].sum(axis=1)
 
 Population.fitness = fitness
 
 def evaluate(self):
-    distances = np.asarray(
-        [self.fitness(chromosome) for chromosome in self.bag]
-    )
+    distances = self.fitness(self.bag)
     self.score = np.min(distances)
-    self.best = self.bag[distances.tolist().index(self.score)]
+    self.best = self.bag[np.argmin(distances)]
     self.parents.append(self.best)
     if False in (distances[0] == distances):
         distances = np.max(distances) - distances
@@ -112,13 +115,17 @@ def evaluate(self):
     
 Population.evaluate = evaluate
 
-def select(self, k=4):
+def select(self, k=4, method="roulette", tournament_size=3):
     fit = self.evaluate()
-    while len(self.parents) < k:
-        idx = np.random.randint(0, len(fit))
-        if fit[idx] > np.random.rand():
-            self.parents.append(self.bag[idx])
-    self.parents = np.asarray(self.parents)
+    count = max(int(k) - len(self.parents), 0)
+    if method == "tournament":
+        # best of tournament_size random chromosomes, for every parent at once
+        contestants = np.random.randint(0, len(fit), size=(count, tournament_size))
+        idx = contestants[np.arange(count), np.argmax(fit[contestants], axis=1)]
+    else:
+        # fitness proportional, fit already sums to 1
+        idx = np.random.choice(len(fit), size=count, p=fit)
+    self.parents = np.vstack([np.asarray(self.parents), self.bag[idx]])
 
 Population.select = select
 
@@ -131,29 +138,33 @@ def swap(chromosome):
     return chromosome
 
 def crossover(self, p_cross=0.1):
-    children = []
     count, size = self.parents.shape
-    for _ in range(len(self.bag)):
-        if np.random.rand() > p_cross:
-            children.append(
-                list(self.parents[np.random.randint(count, size=1)[0]])
-            )
-        else:
-            parent1, parent2 = self.parents[
-                np.random.randint(count, size=2), :
-            ]
-            idx = np.random.choice(range(size), size=2, replace=False)
-            start, end = min(idx), max(idx)
-            child = [None] * size
-            for i in range(start, end + 1, 1):
-                child[i] = parent1[i]
-            pointer = 0
-            for i in range(size):
-                if child[i] is None:
-                    while parent2[pointer] in child:
-                        pointer += 1
-                    child[i] = parent2[pointer]
-            children.append(child)
+    children = self.parents[np.random.randint(count, size=len(self.bag))]
+
+    # order crossover for the children that cross, all at once: keep a slice
+    # of parent1 and fill the rest in parent2's order, skipping the cities the
+    # slice already has, found with a city lookup array instead of a search
+    crossed = np.flatnonzero(np.random.rand(len(self.bag)) <= p_cross)
+    if len(crossed):
+        parent1 = children[crossed]
+        parent2 = self.parents[np.random.randint(count, size=len(crossed))]
+        # two distinct cut points per child
+        start = np.random.randint(size, size=len(crossed))
+        end = np.random.randint(size - 1, size=len(crossed))
+        end += end >= start
+        start, end = np.minimum(start, end), np.maximum(start, end)
+        positions = np.arange(size)
+        in_slice = (positions >= start[:, None]) & (positions <= end[:, None])
+
+        in_child = np.zeros((len(crossed), self.parents.max() + 1), dtype=bool)
+        in_child[np.nonzero(in_slice)[0], parent1[in_slice]] = True
+        from_parent2 = ~in_child[np.arange(len(crossed))[:, None], parent2]
+
+        child = np.empty_like(parent1)
+        child[in_slice] = parent1[in_slice]
+        child[~in_slice] = parent2[from_parent2]
+        children[crossed] = child
+
     return children
 
 Population.crossover = crossover
@@ -183,13 +194,18 @@ def genetic_algorithm(
     print_interval=100,
     return_history=False,
     verbose=False,
+    selection="roulette",
+    tournament_size=3,
+    local_search=None,
+    memetic_rate=0.05,
+    memetic_cap=1,
 ):
     pop = init_population(cities, adjacency_mat, n_population)
     best = pop.best
     score = float("inf")
     history = []
     for i in range(n_iter):
-        pop.select(n_population * selectivity)
+        pop.select(n_population * selectivity, selection, tournament_size)
         history.append(pop.score)
         if verbose:
             print(f"Generation {i}: {pop.score}")
@@ -198,13 +214,25 @@ def genetic_algorithm(
         if pop.score < score:
             best = pop.best
             score = pop.score
-        children = pop.mutate(p_cross, p_mut)
+        children = np.asarray(pop.mutate(p_cross, p_mut))
+        if local_search:
+            # memetic step, polish a share of the children with 2-opt/Or-opt,
+            # at most memetic_cap a generation so the step's cost stays flat
+            polished = np.flatnonzero(np.random.rand(len(children)) < memetic_rate)
+            for j in polished[:memetic_cap]:
+                children[j] = local_search.improve(children[j].tolist())
         pop = Population(children, pop.adjacency_mat)
     if return_history:
         return best, history
     return best
 
-best = genetic_algorithm(cities, adjacency_mat, verbose=False)
+# any waypoint can come first, so the local search may move the first one
+best = genetic_algorithm(
+    cities,
+    adjacency_mat,
+    verbose=False,
+    local_search=LocalSearch(adjacency_mat, fixed_start=False)
+)
 
 # Plotting   
 plt.plot(ox, oy, ".b")
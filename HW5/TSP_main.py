@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+import heapq
 from itertools import permutations
-from math import factorial
+from math import factorial, perm
 import matplotlib.pyplot as plt
-from multiprocessing import Pool
+from multiprocessing import cpu_count, Pool, Value
+import numpy as np
 from os import urandom
 from random import random
 from time import perf_counter
@@ -11,6 +13,171 @@ from time import perf_counter
 def create_path(path: tuple[Point]) -> Path:
     return Path(path=path)
 
+# set in each worker by _init_worker, so jobs are only permutation index ranges
+_worker_distances: np.ndarray = None
+_worker_start: int = None
+_worker_others: list[int] = None
+_worker_count: int = None
+_worker_suffixes: np.ndarray = None
+
+def _init_worker(
+    distances: np.ndarray, start: int, others: list[int], count: int, suffix_length: int
+) -> None:
+    global _worker_distances, _worker_start, _worker_others, _worker_count, _worker_suffixes
+    _worker_distances = distances
+    _worker_start = start
+    _worker_others = others
+    _worker_count = count
+
+    # every ordering of the last suffix_length points, shared by all prefixes
+    _worker_suffixes = np.array(
+        list(permutations(range(suffix_length))), dtype=np.intp
+    ).reshape(-1, suffix_length)
+
+def _prefix_at(rank: int, length: int) -> tuple[list[int], list[int]]:
+    """
+    Unranks the rank-th ordered prefix of length points in lexicographic order
+
+    :return: (prefix, points left after the prefix)
+    """
+    left: list[int] = list(_worker_others)
+    prefix: list[int] = []
+    for position in range(length):
+        block: int = perm(len(left) - 1, length - position - 1)
+        prefix.append(left.pop(rank // block))
+        rank %= block
+    return prefix, left
+
+def _top_tours_in_range(job: tuple[int, int]) -> list[tuple[float, int, list[int]]]:
+    """
+    Scores every tour with a prefix rank in [first, last), one prefix's 
+    suffix orderings at a time in NumPy, keeping the best in a bounded heap
+
+    :return: heap of (-distance, -order, tour)
+    """
+    first, last = job
+    suffix_length: int = _worker_suffixes.shape[1]
+    prefix_length: int = len(_worker_others) - suffix_length
+    suffix_count: int = len(_worker_suffixes)
+
+    heap: list[tuple[float, int, list[int]]] = []
+    for rank in range(first, last):
+        prefix, left = _prefix_at(rank, prefix_length)
+        tours: np.ndarray = np.hstack((
+            np.broadcast_to(prefix, (suffix_count, prefix_length)),
+            np.asarray(left, dtype=np.intp)[_worker_suffixes]
+        )).astype(np.intp)
+        distances: np.ndarray = (
+            _worker_distances[_worker_start, tours[:, 0]] +
+            _worker_distances[tours[:, :-1], tours[:, 1:]].sum(axis=1)
+        )
+
+        # only the chunk's best can make the heap
+        best: np.ndarray = np.argsort(distances, kind="stable")[:_worker_count]
+        for index in best.tolist():
+            # order breaks ties by position in the permutation space
+            entry = (
+                -float(distances[index]), 
+                -(rank * suffix_count + index), 
+                tours[index].tolist()
+            )
+            if len(heap) < _worker_count:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+            else:
+                break
+    return heap
+
+# set in each worker by _init_branch_worker, the best distance is shared by all
+# workers so a tour found by one prunes the others
+_worker_bound: str = None
+_worker_best_distance = None
+
+def _init_branch_worker(
+    distances: np.ndarray, start: int, bound: str, best_distance
+) -> None:
+    global _worker_distances, _worker_start, _worker_bound, _worker_best_distance
+    _worker_distances = distances
+    _worker_start = start
+    _worker_bound = bound
+    _worker_best_distance = best_distance
+
+def _lower_bound(last: int, left: list[int]) -> float:
+    """
+    Admissible bound on the distance to finish a path at last through left
+
+    "mst": the rest of the path spans last and left, so it's at least their 
+        minimum spanning tree (Prim's), needs symmetric distances
+    "edges": every point in left is entered once, from last or another point
+        in left, so it's at least the sum of their cheapest incoming edges
+    """
+    if not left:
+        return 0.0
+
+    points: list[int] = [last] + left
+    distances: np.ndarray = _worker_distances[np.ix_(points, points)]
+    if _worker_bound == "mst":
+        total: float = 0.0
+        in_tree: np.ndarray = np.zeros(len(points), dtype=bool)
+        in_tree[0] = True
+        closest: np.ndarray = distances[0].copy()
+        for _ in range(len(left)):
+            closest[in_tree] = np.inf
+            point: int = int(np.argmin(closest))
+            total += closest[point]
+            in_tree[point] = True
+            closest = np.minimum(closest, distances[point])
+        return float(total)
+
+    np.fill_diagonal(distances, np.inf)
+    return float(distances[:, 1:].min(axis=0).sum())
+
+def _branch(job: tuple[list[int], float]) -> tuple[float, list[int], int, int]:
+    """
+    Depth first branch and bound below a path prefix, nearest point first
+
+    :return: (best distance, best tour or None, nodes explored, nodes pruned)
+    """
+    prefix, distance = job
+    best: list = [float("inf"), None]
+    explored: int = 0
+    pruned: int = 0
+
+    def visit(tour: list[int], left: list[int], distance: float) -> None:
+        nonlocal explored, pruned
+        explored += 1
+        if not left:
+            with _worker_best_distance.get_lock():
+                if distance < _worker_best_distance.value:
+                    _worker_best_distance.value = distance
+            if distance < best[0]:
+                best[:] = [distance, tour]
+            return
+
+        last: int = tour[-1] if tour else _worker_start
+        for point in sorted(left, key=lambda point: _worker_distances[last, point]):
+            child_distance: float = distance + _worker_distances[last, point]
+            child_left: list[int] = [other for other in left if other != point]
+            if (
+                child_distance + _lower_bound(point, child_left) >= 
+                _worker_best_distance.value
+            ):
+                pruned += 1
+                continue
+            visit(tour + [point], child_left, child_distance)
+
+    left: list[int] = [
+        point for point in range(len(_worker_distances)) 
+        if point != _worker_start and point not in prefix
+    ]
+    last: int = prefix[-1] if prefix else _worker_start
+    if distance + _lower_bound(last, left) >= _worker_best_distance.value:
+        pruned += 1
+    else:
+        visit(prefix, left, distance)
+    return best[0], best[1], explored, pruned
+
 class Point:
     def __init__(self, x: float, y: float):
         self.x = x
@@ -46,8 +213,8 @@ class Path:
             if not i:
                 continue
             distance += point.distance_to(self.path[i-1])
-        distance += distance if distance else float("inf")
-        self.set_distance(distance)
+        # an empty path is the worst possible path
+        self.set_distance(distance if self.path else float("inf"))
 
     def plot(self, color: str, linestyle="--", text_points=False):
         x = [point.x for point in self.path]
@@ -72,11 +239,26 @@ class Path:
                 )
 
 class TSP:
-    def __init__(self, points: list[Point]) -> None:
+    def __init__(self, points: list[Point], distances: np.ndarray=None) -> None:
+        """
+        :param points: points to visit
+        :param distances: distances[i, j] is the cost from points[i] to 
+            points[j], like an A* cost matrix, defaults to straight lines
+        """
         self.points = points
 
+        if distances is None:
+            xy: np.ndarray = np.array([point.key for point in self.points])
+            distances = np.hypot(
+                xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1]
+            )
+        self.distances: np.ndarray = np.asarray(distances, dtype=float)
+
         self.distance_matrix: dict[str, dict[str, float]] = self._create_distance_matrix()
 
+    def index_of(self, point: Point) -> int:
+        return [other.key for other in self.points].index(point.key)
+
     def _create_distance_matrix(self) -> dict:
         print("Creating distance matrix...")
 
@@ -88,13 +270,213 @@ class TSP:
         #         ...
         #     },
         # }
-        for point in self.points:
+        for i, point in enumerate(self.points):
             matrix[point.key] = {}
-            for other in self.points:
-                matrix[point.key][other.key] = point.distance_to(other)
+            for j, other in enumerate(self.points):
+                matrix[point.key][other.key] = float(self.distances[i, j])
         return matrix
 
-    def top_paths(self, start: Point, count: int=1) -> tuple[Path]:
+    def held_karp(self, start: Point) -> Path:
+        """
+        Exact shortest path from start through every other point, by dynamic
+        programming over subsets (Held-Karp). Takes 2^(n-1) * (n-1) time and 
+        memory, which is fine up to about 20 points.
+
+        :param start: fixed first point, like top_paths
+        :return: shortest path, without start like top_paths, its distance
+            includes the leg from start
+        """
+        start_index: int = self.index_of(start)
+        others: list[int] = [
+            i for i in range(len(self.points)) if i != start_index
+        ]
+        count: int = len(others)
+        distances: np.ndarray = self.distances[np.ix_(others, others)]
+
+        # costs[mask, j] is the cheapest path from start through the points in
+        # mask (bit i is others[i]) ending at j, parents[mask, j] is the point 
+        # before j on it
+        costs: np.ndarray = np.full((1 << count, count), np.inf)
+        parents: np.ndarray = np.zeros((1 << count, count), dtype=np.int8)
+        costs[1 << np.arange(count), np.arange(count)] = (
+            self.distances[start_index, others]
+        )
+
+        # subsets are solved in order of size so every smaller subset is done,
+        # each (size, j) step relaxes all of its subsets at once
+        masks: np.ndarray = np.arange(1 << count)
+        sizes: np.ndarray = sum((masks >> bit) & 1 for bit in range(count))
+        for size in range(2, count + 1):
+            size_masks: np.ndarray = masks[sizes == size]
+            for j in range(count):
+                j_masks: np.ndarray = size_masks[(size_masks >> j) & 1 == 1]
+                candidates: np.ndarray = (
+                    costs[j_masks ^ (1 << j)] + distances[:, j]
+                )
+                parents[j_masks, j] = np.argmin(candidates, axis=1)
+                costs[j_masks, j] = candidates[
+                    np.arange(len(j_masks)), parents[j_masks, j]
+                ]
+
+        # walk the parents back from the cheapest end point
+        mask: int = (1 << count) - 1
+        j: int = int(np.argmin(costs[mask]))
+        distance: float = float(costs[mask, j])
+        order: list[int] = []
+        while mask:
+            order.append(j)
+            mask, j = mask ^ (1 << j), int(parents[mask, j])
+
+        path: Path = Path(path=tuple(self.points[others[i]] for i in reversed(order)))
+        path.set_distance(distance)
+        return path
+
+    def path_distance(self, start: int, tour: list[int]) -> float:
+        """
+        Distance of the path from point index start through the tour indices
+        """
+        stops: list[int] = [start] + list(tour)
+        return float(self.distances[stops[:-1], stops[1:]].sum())
+
+    def greedy_tour(self, start: int) -> list[int]:
+        """
+        Nearest neighbor path from point index start, improved with 2-opt 
+        until no reversal makes it shorter
+
+        :return: point indices after start
+        """
+        tour: list[int] = []
+        left: list[int] = [i for i in range(len(self.points)) if i != start]
+        last: int = start
+        while left:
+            last = min(left, key=lambda point: self.distances[last, point])
+            tour.append(last)
+            left.remove(last)
+
+        # every reversal is scored at once from prefix sums of the legs, both
+        # ways so asymmetric distances work too, and the best one is applied
+        distances: np.ndarray = self.distances
+        count: int = len(tour)
+        first: np.ndarray = np.arange(1, count + 1)[:, None]
+        final: np.ndarray = np.arange(1, count + 1)[None, :]
+        has_next: np.ndarray = final < count
+        while count > 1:
+            stops: np.ndarray = np.array([start] + tour)
+            forward: np.ndarray = np.concatenate(
+                ([0.0], np.cumsum(distances[stops[:-1], stops[1:]]))
+            )
+            backward: np.ndarray = np.concatenate(
+                ([0.0], np.cumsum(distances[stops[1:], stops[:-1]]))
+            )
+            after: np.ndarray = stops[np.minimum(final + 1, count)]
+
+            # stops[first:final + 1] reversed, minus the legs it replaces
+            change: np.ndarray = (
+                distances[stops[first - 1], stops[final]] -
+                distances[stops[first - 1], stops[first]] +
+                backward[final] - backward[first] -
+                forward[final] + forward[first] +
+                np.where(
+                    has_next,
+                    distances[stops[first], after] - distances[stops[final], after],
+                    0.0
+                )
+            )
+            change[final <= first] = 0.0
+
+            i, j = np.unravel_index(np.argmin(change), change.shape)
+            if change[i, j] >= -1e-12:
+                break
+            tour[i:j + 1] = tour[i:j + 1][::-1]
+        return tour
+
+    def branch_and_bound(
+        self, 
+        start: Point, 
+        bound: str="mst", 
+        split_depth: int=2, 
+        processes: int=None
+    ) -> Path:
+        """
+        Exact shortest path from start through every other point by depth 
+        first branch and bound, seeded with the greedy 2-opt path. Partial 
+        paths whose distance plus a lower bound on the rest can't beat the
+        best path so far are pruned. The paths split_depth points deep are
+        searched in parallel, sharing the best distance.
+
+        Sets nodes_explored, nodes_pruned and prune_rate for tuning.
+
+        :param start: fixed first point, like top_paths
+        :param bound: "mst" (tighter, needs symmetric distances) or "edges"
+        :param split_depth: prefix length of the parallel jobs
+        :param processes: worker count, None for one per cpu
+        :return: shortest path, without start like top_paths, its distance
+            includes the leg from start
+        """
+        if bound not in ("mst", "edges"):
+            raise ValueError(f"Unknown bound: {bound}")
+
+        start_index: int = self.index_of(start)
+        best_tour: list[int] = self.greedy_tour(start_index)
+        best_distance = Value("d", self.path_distance(start_index, best_tour))
+
+        # prefixes of split_depth points are the jobs
+        others: list[int] = [
+            i for i in range(len(self.points)) if i != start_index
+        ]
+        jobs: list[tuple[list[int], float]] = [
+            (list(prefix), self.path_distance(start_index, prefix))
+            for prefix in permutations(others, min(split_depth, len(others)))
+        ]
+        jobs.sort(key=lambda job: job[1])
+
+        start_time: float = perf_counter()
+        print(f"Branching {len(jobs):,} prefixes...", end=" ")
+        with Pool(
+            processes=processes,
+            initializer=_init_branch_worker,
+            initargs=(self.distances, start_index, bound, best_distance)
+        ) as pool:
+            results: list[tuple[float, list[int], int, int]] = pool.map(
+                _branch, jobs, chunksize=1
+            )
+        print(f"{perf_counter() - start_time:.2f}s")
+
+        distance: float = self.path_distance(start_index, best_tour)
+        for job_distance, tour, _explored, _pruned in results:
+            if tour is not None and job_distance < distance:
+                distance, best_tour = job_distance, tour
+
+        self.nodes_explored: int = sum(result[2] for result in results)
+        self.nodes_pruned: int = sum(result[3] for result in results)
+        # a search with nothing to branch on may visit no nodes at all
+        visited: int = self.nodes_explored + self.nodes_pruned
+        self.prune_rate: float = self.nodes_pruned / visited if visited else 0.0
+        print(
+            f"Nodes explored: {self.nodes_explored:,}, "
+            f"pruned: {self.nodes_pruned:,} ({self.prune_rate:.1%})"
+        )
+
+        path: Path = Path(path=tuple(self.points[i] for i in best_tour))
+        path.set_distance(float(distance))
+        return path
+
+    def top_paths(
+        self, start: Point, count: int=1, streaming: bool=True, processes: int=None
+    ) -> tuple[Path]:
+        """
+        Shortest paths from start through every other point, by brute force
+
+        :param start: fixed first point
+        :param count: number of paths to keep
+        :param streaming: score permutations in index ranges on the workers
+            instead of materializing all of them first, memory stays flat
+        :param processes: worker count, None for one per cpu
+        :return: shortest paths, shortest first, without start, their 
+            distances include the leg from start
+        """
+        if streaming:
+            return self._stream_top_paths(start, count, processes)
 
         # if we knew start was [0] slicing could be faster
         points = [point for point in self.points if point.key != start.key]
@@ -131,6 +513,46 @@ class TSP:
         print(f"{perf_counter() - start_time:.2f}s")
         return top_paths
 
+    def _stream_top_paths(
+        self, start: Point, count: int, processes: int=None
+    ) -> tuple[Path]:
+        start_index: int = self.index_of(start)
+        others: list[int] = [
+            i for i in range(len(self.points)) if i != start_index
+        ]
+
+        # each prefix rank stands for the suffix_length! tours that start with
+        # it, workers get contiguous ranges of prefix ranks
+        suffix_length: int = min(len(others), 8)
+        prefix_count: int = perm(len(others), len(others) - suffix_length)
+        job_count: int = min(prefix_count, 4 * (processes or cpu_count()))
+        bounds: list[int] = [
+            prefix_count * job // job_count for job in range(job_count + 1)
+        ]
+        jobs: list[tuple[int, int]] = list(zip(bounds[:-1], bounds[1:]))
+
+        start_time: float = perf_counter()
+        print(f"Streaming {factorial(len(others)):,} permutations...", end=" ")
+        with Pool(
+            processes=processes,
+            initializer=_init_worker,
+            initargs=(self.distances, start_index, others, count, suffix_length)
+        ) as pool:
+            heaps: list[list[tuple[float, int, list[int]]]] = pool.map(
+                _top_tours_in_range, jobs
+            )
+        print(f"{perf_counter() - start_time:.2f}s")
+
+        # merge the worker heaps
+        top_paths: list[Path] = []
+        for distance, _order, tour in heapq.nlargest(
+            count, (entry for heap in heaps for entry in heap)
+        ):
+            path: Path = Path(path=tuple(self.points[i] for i in tour))
+            path.set_distance(-distance)
+            top_paths.append(path)
+        return top_paths
+
 def main():
     print("Getting points...")
     points: list[Point] = [
@@ -149,6 +571,15 @@ def main():
 
     tsp: TSP = TSP(points)
 
+    print(f"Finding shortest path with Held-Karp (Points: {len(tsp.points)})...", end=" ")
+    start_time: float = perf_counter()
+    shortest_path: Path = tsp.held_karp(start=points[0])
+    print(f"{perf_counter() - start_time:.2f}s, Distance: {shortest_path.distance:.2f}")
+
+    print(f"Finding shortest path with branch and bound (Points: {len(tsp.points)})...")
+    shortest_path = tsp.branch_and_bound(start=points[0])
+    print(f"Distance: {shortest_path.distance:.2f}")
+
     print(f"Finidng shortest path (Points: {len(tsp.points)})...")
     top_paths: tuple[Path] = tsp.top_paths(start=points[0], count=2)
     for i, path in enumerate(top_paths):
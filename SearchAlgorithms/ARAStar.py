@@ -0,0 +1,242 @@
+from __future__ import annotations
+from typing import Iterator
+
+from Grid import Grid
+from Node import Node
+from OpenSet import OpenSet
+from PathFinder import PathFinder
+from Stopwatch import Stopwatch
+
+class ARAStar(PathFinder):
+    def __init__(
+        self,
+        start: Node,
+        goal: Node,
+        grid: Grid,
+        epsilon: float=3.0,
+        epsilon_step: float=0.5,
+        time_budget: float=None
+    ) -> None:
+        """
+        Anytime repairing A*. A first path comes from A* with its heuristic
+        inflated by epsilon, then epsilon is lowered towards 1 and the search
+        is repaired instead of restarted: cells that got cheaper after being
+        expanded wait in an inconsistent list and only they and the open set
+        are searched again. Every path's cost is within bound times the
+        optimal cost. Same moves and costs as AStar once epsilon reaches 1.
+
+        :param epsilon: heuristic inflation of the first search, >= 1
+        :param epsilon_step: how much epsilon is lowered after each search
+        :param time_budget: seconds to search before stopping with the best
+            path so far, None searches until epsilon reaches 1
+        """
+        self.epsilon = epsilon
+        self.epsilon_step = epsilon_step
+        self.time_budget = time_budget
+        super().__init__(start, goal, grid)
+
+    def reset(self) -> None:
+        super().reset()
+
+        # cheapest node found so far per cell, and the cells that got cheaper
+        # after being expanded in the current search
+        self._nodes: dict[tuple[int, int], Node] = {}
+        self._inconsistent: dict[tuple[int, int], Node] = {}
+
+        # goal's cost and the goal cell's node it's reached through
+        self._goal_cost: float = float("inf")
+        self._goal_parent: Node = None
+
+        # suboptimality bound of the current path, and (seconds, cost, bound)
+        # for every improved path
+        self.bound: float = float("inf")
+        self.solutions: list[tuple[float, float, float]] = []
+
+    def budget_spent(self, stopwatch: Stopwatch) -> bool:
+        return (
+            self.time_budget is not None and
+            stopwatch.running_time >= self.time_budget
+        )
+
+    def add_neighbors_to_open_set(self, epsilon: float) -> None:
+        """
+        Adds neighbors of the current node that got cheaper to the open set,
+        or to the inconsistent list if they were already expanded
+        """
+        # instead of nested loops, we define a list of valid moves in cells
+        diagonal_moves = [
+            (-1, -1),  # left bottom
+            (-1, 1),   # left top
+            (1, -1),   # right bottom
+            (1, 1),    # right top
+        ]
+
+        move_list = [
+            (-1, 0),   # left center
+            (0, -1),   # center bottom
+            (0, 1),    # center top
+            (1, 0),    # right center
+        ]
+
+        if self.do_diagonals:
+            move_list += diagonal_moves
+
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
+        for move in move_list:
+            neighbor_cell: tuple[int, int] = (
+                current_cell[0] + move[0], current_cell[1] + move[1]
+            )
+            if not self.grid.cell_is_valid(neighbor_cell):
+                continue
+
+            neighbor: Node = self.grid.node_at(
+                neighbor_cell, parent=self._current_node
+            )
+            neighbor.start_to_node_cost = (
+                self._current_node.start_to_node_cost +
+                neighbor.distance_to(self._current_node)
+            )
+
+            # only cheaper than what we've already got is worth noting
+            best: Node = self._nodes.get(neighbor_cell)
+            if best and neighbor.start_to_node_cost >= best.start_to_node_cost:
+                continue
+
+            neighbor.heuristic_cost = epsilon * neighbor.distance_to(self.goal)
+            self._nodes[neighbor_cell] = neighbor
+            if neighbor_cell in self._closed_set:
+                self._inconsistent[neighbor_cell] = neighbor
+            else:
+                self._open_set[neighbor_cell] = neighbor
+
+    def improve_path(self, epsilon: float, stopwatch: Stopwatch) -> bool:
+        """
+        Expands cells until the goal is no more expensive than the cheapest
+        inflated cost in the open set
+
+        :return: False if the time budget ran out first
+        """
+        goal_cell: tuple[int, int] = self.grid.cell_of(self.goal)
+        while self._open_set:
+            if self._goal_cost <= self._open_set.peek().total_cost:
+                return True
+
+            if self.budget_spent(stopwatch):
+                return False
+
+            current_cell, self._current_node = self._open_set.pop()
+            self._closed_set[current_cell] = self._current_node
+
+            # the goal is reached through its cell, like AStar
+            if current_cell == goal_cell:
+                cost: float = (
+                    self._current_node.start_to_node_cost +
+                    self._current_node.distance_to(self.goal)
+                )
+                if cost < self._goal_cost:
+                    self._goal_cost = cost
+                    self._goal_parent = self._current_node
+
+            self.add_neighbors_to_open_set(epsilon)
+
+        return True
+
+    def suboptimality_bound(self, epsilon: float) -> float:
+        """
+        How far the goal's cost can be from optimal, any cell still to be
+        (re)expanded gives a lower bound on the optimal cost
+
+        :param epsilon: epsilon of the last search that ran to completion,
+            inf if none did
+        :return: bound, 1 if the goal's cost is optimal
+        """
+        lower_bound: float = min(
+            (
+                node.start_to_node_cost + node.distance_to(self.goal)
+                for node in (
+                    *self._open_set.values(), *self._inconsistent.values()
+                )
+            ),
+            default=float("inf")
+        )
+        return max(min(epsilon, self._goal_cost / lower_bound), 1.0)
+
+    def improved_paths(self) -> Iterator[tuple[list[Node], float]]:
+        """
+        Searches with a shrinking epsilon until it reaches 1 or the time
+        budget runs out, yielding each time the path or its bound improves
+
+        :return: (path, bound) pairs, the path is goal first like
+            PathFinder.path
+        """
+        stopwatch: Stopwatch = Stopwatch()
+        stopwatch.start()
+
+        # initialize open set with start node
+        epsilon: float = max(self.epsilon, 1.0)
+        start_cell: tuple[int, int] = self.grid.cell_of(self.start)
+        self.start.heuristic_cost = epsilon * self.start.distance_to(self.goal)
+        self._nodes[start_cell] = self.start
+        self._open_set[start_cell] = self.start
+
+        completed_epsilon: float = float("inf")
+        while True:
+            finished: bool = self.improve_path(epsilon, stopwatch)
+
+            # a search cut short by the budget doesn't guarantee its epsilon
+            if finished:
+                completed_epsilon = epsilon
+
+            if self._goal_parent:
+                bound: float = self.suboptimality_bound(completed_epsilon)
+                if (
+                    not self.solutions or
+                    self._goal_cost < self.solutions[-1][1] or
+                    bound < self.bound
+                ):
+                    # update goal cost and parent with the goal cell's node
+                    self.goal.start_to_node_cost = self._goal_cost
+                    self.goal.parent = self._goal_parent
+                    self.bound = bound
+
+                    # get path, looping backwards through the parents
+                    self._path = [self.goal]
+                    while self._path[-1] != self.start:
+                        self._path.append(self._path[-1].parent)
+
+                    self.solutions.append(
+                        (stopwatch.running_time, self._goal_cost, bound)
+                    )
+                    yield self._path, bound
+
+            # stop once the budget is spent or the path is optimal, a search
+            # that ran out of cells without the goal won't find it with any
+            # epsilon either
+            if (
+                not finished or not self._goal_parent or
+                epsilon == 1.0 or self.bound == 1.0
+            ):
+                break
+
+            # tighten epsilon and search the open set and inconsistent cells
+            # again, everything else keeps its cost from the previous searches
+            epsilon = max(epsilon - self.epsilon_step, 1.0)
+            nodes: dict[tuple[int, int], Node] = {
+                **self._open_set, **self._inconsistent
+            }
+            self._open_set = OpenSet()
+            for cell, node in nodes.items():
+                node.heuristic_cost = epsilon * node.distance_to(self.goal)
+                self._open_set[cell] = node
+            self._inconsistent = {}
+            self._closed_set = {}
+
+        if not self._goal_parent:
+            raise ValueError(
+                "No path found within the time budget"
+                if not finished else "No path found"
+            )
+
+    def find_path(self) -> None:
+        for _path, _bound in self.improved_paths():
+            pass
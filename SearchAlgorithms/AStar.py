@@ -13,29 +13,31 @@ class AStar(PathFinder):
         """
         Adds neighbors of the current node to open set.
         """
-        # instead of nested loops, we define a list of valid moves
+        # instead of nested loops, we define a list of valid moves in cells
         diagonal_moves = [
-            (-self.grid.grid_spacing, -self.grid.grid_spacing),  # left bottom
-            (-self.grid.grid_spacing, self.grid.grid_spacing),   # left top
-            (self.grid.grid_spacing, -self.grid.grid_spacing),   # right bottom
-            (self.grid.grid_spacing, self.grid.grid_spacing),    # right top
+            (-1, -1),  # left bottom
+            (-1, 1),   # left top
+            (1, -1),   # right bottom
+            (1, 1),    # right top
         ]
 
         move_list = [
-            (-self.grid.grid_spacing, 0),                        # left center
-            (0, -self.grid.grid_spacing),                        # center bottom
-            (0, self.grid.grid_spacing),                         # center top
-            (self.grid.grid_spacing, 0),                         # right center
+            (-1, 0),   # left center
+            (0, -1),   # center bottom
+            (0, 1),    # center top
+            (1, 0),    # right center
         ]
 
         if self.do_diagonals:
             move_list += diagonal_moves
 
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
         for move in move_list:
-            neighbor: Node = Node(
-                x=self._current_node.x + move[0],
-                y=self._current_node.y + move[1],
-                parent=self._current_node
+            neighbor_cell: tuple[int, int] = (
+                current_cell[0] + move[0], current_cell[1] + move[1]
+            )
+            neighbor: Node = self.grid.node_at(
+                neighbor_cell, parent=self._current_node
             )
 
             if not self.grid.node_is_valid(neighbor):
@@ -48,38 +50,37 @@ class AStar(PathFinder):
             neighbor.heuristic_cost = neighbor.distance_to(self.goal)
 
             # if we've already noted this neighbor
-            if neighbor.id in self._open_set:
+            if neighbor_cell in self._open_set:
                 # if its cost got cheaper
-                if neighbor.total_cost < self._open_set[neighbor.id].total_cost:
-                    self._open_set[neighbor.id] = neighbor
+                if neighbor.total_cost < self._open_set[neighbor_cell].total_cost:
+                    self._open_set[neighbor_cell] = neighbor
 
             # brand new neighbor
-            elif neighbor.id not in self._closed_set:
-                self._open_set[neighbor.id] = neighbor
+            elif neighbor_cell not in self._closed_set:
+                self._open_set[neighbor_cell] = neighbor
         
 
     def find_path(self) -> None:
+        goal_cell: tuple[int, int] = self.grid.cell_of(self.goal)
+
         # initialize open set with start node
-        self._open_set[self.start.id] = self.start
-        self._current_node = self.start
+        self._open_set[self.grid.cell_of(self.start)] = self.start
 
-        # while we are not at the goal
-        while self._current_node != self.goal:
-            # add neighbors to open set
-            self.add_neighbors_to_open_set()
+        while True:
+            # get node from open set with smallest total cost, raises a 
+            # ValueError if the open set runs out
+            current_cell, self._current_node = self._open_set.pop()
 
-            # remove current node from open set
-            del self._open_set[self._current_node.id]
+            # stop once we are at the goal
+            if current_cell == goal_cell:
+                break
 
             # add current node to closed set
-            self._closed_set[self._current_node.id] = self._current_node
+            self._closed_set[current_cell] = self._current_node
+
+            # add neighbors to open set
+            self.add_neighbors_to_open_set()
 
-            # get node from open set with smallest total cost
-            self._current_node = min(
-                self._open_set.values(),
-                key=lambda node: node.total_cost
-            )
-        
         # update goal cost and parent with current node
         self.goal.start_to_node_cost = (
             self._current_node.start_to_node_cost +
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import heapq
+import itertools
+import math
+import numpy as np
+
+from Grid import Grid
+from Node import Node
+from PathFinder import PathFinder
+
+class ArrayAStar(PathFinder):
+    def __init__(self, start: Node, goal: Node, grid: Grid) -> None:
+        """
+        A* that keeps its search state in flat NumPy arrays indexed by cell
+        instead of a Node per neighbor. Same moves, costs and tie breaking as
+        AStar, the path is rebuilt into Nodes once the goal is reached.
+        """
+        super().__init__(start, goal, grid)
+
+    @property
+    def open_set(self) -> dict[tuple[int, int], Node]:
+        """
+        Nodes for the cells still open, created on request for plotting
+        """
+        return self._nodes_where(
+            (self._visited == self._generation) & 
+            (self._closed != self._generation)
+        )
+
+    @property
+    def closed_set(self) -> dict[tuple[int, int], Node]:
+        """
+        Nodes for the expanded cells, created on request for plotting
+        """
+        return self._nodes_where(self._closed == self._generation)
+
+    def reset(self) -> None:
+        super().reset()
+
+        # the arrays are only (re)built when the grid changes, otherwise a new 
+        # generation is enough to invalidate the previous search
+        if getattr(self, "_grid_version", None) != self.grid._version:
+            self._allocate()
+
+    def _allocate(self) -> None:
+        """
+        Builds the padded occupancy copy and the per cell search arrays
+        """
+        self._grid_version: int = self.grid._version
+
+        # occupancy padded with a blocked border, so a neighbor's flat index
+        # is always index + offset without wrapping to another row
+        blocked: np.ndarray = np.pad(
+            self.grid._occupancy, 1, constant_values=True
+        )
+        self._row_count: int = blocked.shape[0]
+        self._row_length: int = blocked.shape[1]
+        self._blocked: np.ndarray = blocked.ravel()
+
+        # g-costs, f-costs and parents are only meaningful where _visited holds
+        # the current generation, a cell is closed where _closed does
+        self._g_costs: np.ndarray = np.empty(self._blocked.size)
+        self._f_costs: np.ndarray = np.empty(self._blocked.size)
+        self._parents: np.ndarray = np.empty(self._blocked.size, dtype=np.int32)
+        self._visited: np.ndarray = np.zeros(self._blocked.size, dtype=np.int32)
+        self._closed: np.ndarray = np.zeros(self._blocked.size, dtype=np.int32)
+
+        # same move order as AStar.add_neighbors_to_open_set, so ties break the
+        # same way
+        moves: list[tuple[int, int]] = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+        if self.do_diagonals:
+            moves += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+        self._move_offsets: np.ndarray = np.array(
+            [dx * self._row_length + dy for dx, dy in moves]
+        )
+        self._move_costs: np.ndarray = np.array(
+            [math.hypot(dx, dy) * self.grid.grid_spacing for dx, dy in moves]
+        )
+
+    def index_of(self, cell: tuple[int, int]) -> int:
+        """
+        Flat index of a cell in the padded search arrays
+
+        :param cell: (ix, iy) cell indices
+        :return: flat index
+        :raises ValueError: if the cell is outside the padded arrays, its
+            index would wrap into another row
+        """
+        ix: int = cell[0] - self.grid._cell_offset[0] + 1
+        iy: int = cell[1] - self.grid._cell_offset[1] + 1
+        if not (0 <= ix < self._row_count and 0 <= iy < self._row_length):
+            raise ValueError("No path found")
+        return ix * self._row_length + iy
+
+    def cells_at(self, indices: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Cells of flat indices in the padded search arrays
+
+        :param indices: flat indices
+        :return: (x cell indices, y cell indices)
+        """
+        return (
+            indices // self._row_length - 1 + self.grid._cell_offset[0],
+            indices % self._row_length - 1 + self.grid._cell_offset[1]
+        )
+
+    def _nodes_where(self, mask: np.ndarray) -> dict[tuple[int, int], Node]:
+        """
+        Creates nodes with their costs for the flat indices where mask is True
+        """
+        indices: np.ndarray = np.flatnonzero(mask)
+        x_cells, y_cells = self.cells_at(indices)
+        return {
+            (ix, iy): self.grid.node_at(
+                (ix, iy),
+                start_to_node_cost=g_cost,
+                heuristic_cost=f_cost - g_cost
+            )
+            for ix, iy, g_cost, f_cost in zip(
+                x_cells.tolist(),
+                y_cells.tolist(),
+                self._g_costs[indices].tolist(),
+                self._f_costs[indices].tolist()
+            )
+        }
+
+    def find_path(self) -> None:
+        start_index: int = self.index_of(self.grid.cell_of(self.start))
+        goal_index: int = self.index_of(self.grid.cell_of(self.goal))
+        spacing: float = self.grid.grid_spacing
+        x_offset: int = self.grid._cell_offset[0] - 1
+        y_offset: int = self.grid._cell_offset[1] - 1
+        generation: int = self._generation
+
+        # initialize open set with start cell, entries are
+        # (total cost, insertion count, index)
+        self._g_costs[start_index] = self.start.start_to_node_cost
+        self._f_costs[start_index] = self.start.total_cost
+        self._visited[start_index] = generation
+        counter = itertools.count()
+        open_heap: list[tuple[float, int, int]] = [
+            (self.start.total_cost, next(counter), start_index)
+        ]
+
+        while True:
+            if not open_heap:
+                raise ValueError("No path found")
+
+            # get cell from open set with smallest total cost, skipping entries
+            # that were closed or made cheaper since they were pushed
+            total_cost, _count, index = heapq.heappop(open_heap)
+            if (
+                self._closed[index] == generation or 
+                total_cost > self._f_costs[index]
+            ):
+                continue
+
+            # stop once we are at the goal
+            if index == goal_index:
+                break
+
+            # add current cell to closed set
+            self._closed[index] = generation
+
+            # neighbors that are open and got cheaper, or are brand new, the
+            # start steps from where it is instead of its cell's center like
+            # AStar
+            neighbors: np.ndarray = index + self._move_offsets
+            if index == start_index:
+                g_costs: np.ndarray = self._g_costs[index] + np.hypot(
+                    (neighbors // self._row_length + x_offset) * spacing - self.start.x,
+                    (neighbors % self._row_length + y_offset) * spacing - self.start.y
+                )
+            else:
+                g_costs: np.ndarray = self._g_costs[index] + self._move_costs
+            better: np.ndarray = (
+                ~self._blocked[neighbors] &
+                (self._closed[neighbors] != generation) &
+                (
+                    (self._visited[neighbors] != generation) |
+                    (g_costs < self._g_costs[neighbors])
+                )
+            )
+            if not better.any():
+                continue
+
+            neighbors = neighbors[better]
+            g_costs = g_costs[better]
+            f_costs: np.ndarray = g_costs + np.hypot(
+                (neighbors // self._row_length + x_offset) * spacing - self.goal.x,
+                (neighbors % self._row_length + y_offset) * spacing - self.goal.y
+            )
+            self._g_costs[neighbors] = g_costs
+            self._f_costs[neighbors] = f_costs
+            self._parents[neighbors] = index
+            self._visited[neighbors] = generation
+
+            for f_cost, neighbor in zip(f_costs.tolist(), neighbors.tolist()):
+                heapq.heappush(open_heap, (f_cost, next(counter), neighbor))
+
+        # nodes for the cells from the goal's back to the start's, whose node
+        # is the start itself
+        indices: list[int] = [goal_index]
+        while indices[-1] != start_index:
+            indices.append(int(self._parents[indices[-1]]))
+
+        nodes: list[Node] = []
+        x_cells, y_cells = self.cells_at(np.array(indices[:-1]))
+        for ix, iy, index in zip(x_cells.tolist(), y_cells.tolist(), indices[:-1]):
+            nodes.append(self.grid.node_at(
+                (ix, iy), start_to_node_cost=float(self._g_costs[index])
+            ))
+        nodes.append(self.start)
+        for node, parent in zip(nodes, nodes[1:]):
+            node.parent = parent
+
+        # update goal cost and parent with the goal cell's node, like AStar
+        self.goal.start_to_node_cost = (
+            nodes[0].start_to_node_cost + nodes[0].distance_to(self.goal)
+        )
+        self.goal.parent = nodes[0]
+
+        # get path, looping backwards through the parents
+        self._path = [self.goal]
+        while self._path[-1] != self.start:
+            self._path.append(self._path[-1].parent)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+from multiprocessing import Pool
+
+# path finders imports
+from ARAStar import ARAStar
+from ArrayAStar import ArrayAStar
+from AStar import AStar
+from BidirectionalAStar import BidirectionalAStar
+from DStarLite import DStarLite
+from Dijkstra import Dijkstra
+from JumpPointSearch import JumpPointSearch
+from RRT import RRT
+from RRTConnect import RRTConnect
+from RRTStar import RRTStar
+from ThetaStar import ThetaStar
+
+# support imports
+from Grid import Grid
+from Node import Node
+from PathFinder import PathFinder
+from Stopwatch import Stopwatch
+
+PATH_FINDERS: dict[str, type[PathFinder]] = {
+    path_finder.__name__: path_finder
+    for path_finder in (
+        ARAStar, AStar, ArrayAStar, BidirectionalAStar, DStarLite, Dijkstra, 
+        JumpPointSearch, RRT, RRTConnect, RRTStar, ThetaStar
+    )
+}
+
+# sampling planners that search forever on an unreachable goal unless given
+# a budget, one such query would hang the whole batch
+BUDGET_PARAMS: dict[str, str] = {
+    "RRT": "max_iterations",
+    "RRTConnect": "max_iterations",
+}
+
+class PlannedPath:
+    def __init__(
+        self,
+        start: tuple[float, float],
+        goal: tuple[float, float],
+        x: list[float]=None,
+        y: list[float]=None,
+        cost: float=float("inf"),
+        time: float=0.0,
+        error: str=None
+    ) -> None:
+        """
+        Result of one batch query, the path coordinates run goal to start like
+        PathFinder.path. A query with no path has an error and infinite cost.
+        """
+        self.start = start
+        self.goal = goal
+        self.x = x if x else []
+        self.y = y if y else []
+        self.cost = cost
+        self.time = time
+        self.error = error
+
+    @property
+    def found(self) -> bool:
+        return self.error is None
+
+# set in each worker by _init_worker, the grid is handed over once per worker
+# instead of once per query
+_worker_grid: Grid = None
+_worker_path_finders: dict[str, PathFinder] = {}
+
+def _init_worker(grid: Grid) -> None:
+    global _worker_grid, _worker_path_finders
+    _worker_grid = grid
+    _worker_path_finders = {}
+
+def _find_path(
+    query: tuple[str, dict, tuple[float, float], tuple[float, float]]
+) -> PlannedPath:
+    """
+    Runs one query in a worker, reusing the worker's path finder for the
+    algorithm and params
+    """
+    algorithm, params, start, goal = query
+
+    key: str = f"{algorithm}{sorted(params.items())}"
+    stopwatch: Stopwatch = Stopwatch()
+    stopwatch.start()
+    try:
+        if key not in _worker_path_finders:
+            _worker_path_finders[key] = PATH_FINDERS[algorithm](
+                start=Node(*start), goal=Node(*goal), grid=_worker_grid, **params
+            )
+        path_finder: PathFinder = _worker_path_finders[key]
+
+        path_finder.start = Node(*start)
+        path_finder.goal = Node(*goal)
+        path_finder.reset()
+        path_finder.find_path()
+        stopwatch.stop()
+        return PlannedPath(
+            start=start,
+            goal=goal,
+            x=[node.x for node in path_finder.path],
+            y=[node.y for node in path_finder.path],
+            cost=path_finder.path[0].total_cost,
+            time=stopwatch.elapsed_time
+        )
+
+    # any failure is this query's alone, the rest of the batch carries on
+    except Exception as error:
+        stopwatch.stop()
+        return PlannedPath(
+            start=start,
+            goal=goal,
+            time=stopwatch.elapsed_time,
+            error=str(error)
+        )
+
+class BatchPlanner:
+    def __init__(
+        self,
+        grid: Grid,
+        algorithm: str="AStar",
+        processes: int=None,
+        **params
+    ) -> None:
+        """
+        Runs many start/goal queries against one grid
+
+        :param grid: grid shared read only by every query
+        :param algorithm: name of the path finder, see PATH_FINDERS
+        :param processes: worker count, None for one per cpu, 1 runs the
+            queries in this process
+        :param params: extra path finder params, like the scenario's
+            algorithm params
+        """
+        if algorithm not in PATH_FINDERS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if algorithm in BUDGET_PARAMS and not params.get(BUDGET_PARAMS[algorithm]):
+            raise ValueError(
+                f"{algorithm} needs a {BUDGET_PARAMS[algorithm]} budget in a batch"
+            )
+
+        self.grid = grid
+        self.algorithm = algorithm
+        self.processes = processes
+        self.params = params
+
+        self.stopwatch: Stopwatch = Stopwatch()
+
+    def find_paths(self, queries: list[tuple[Node, Node]]) -> list[PlannedPath]:
+        """
+        Finds a path for every (start, goal) pair
+
+        :param queries: (start, goal) pairs
+        :return: planned paths in the same order as the queries
+        """
+        jobs: list[tuple[str, dict, tuple[float, float], tuple[float, float]]] = [
+            (self.algorithm, self.params, (start.x, start.y), (goal.x, goal.y))
+            for start, goal in queries
+        ]
+
+        self.stopwatch.start()
+        if self.processes == 1:
+            _init_worker(self.grid)
+            planned_paths: list[PlannedPath] = [_find_path(job) for job in jobs]
+
+        else:
+            with Pool(
+                processes=self.processes,
+                initializer=_init_worker,
+                initargs=(self.grid,)
+            ) as pool:
+                planned_paths: list[PlannedPath] = pool.map(_find_path, jobs)
+        self.stopwatch.stop()
+
+        return planned_paths
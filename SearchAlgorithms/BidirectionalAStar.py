@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from Grid import Grid
+from Node import Node
+from OpenSet import OpenSet
+from PathFinder import PathFinder
+
+class BidirectionalAStar(PathFinder):
+    def __init__(self, start: Node, goal: Node, grid: Grid) -> None:
+        """
+        A* from the start and from the goal at the same time, always expanding
+        the smaller frontier. Both searches use the average of the distance to
+        goal and distance to start heuristics, which keeps them consistent
+        with each other, so the search can stop as soon as
+        top_forward + top_reverse >= best_meeting_cost + p_reverse(goal).
+        Same moves and costs as AStar.
+        """
+        super().__init__(start, goal, grid)
+
+    @property
+    def open_set(self) -> dict[tuple[int, int], Node]:
+        """
+        Both frontiers, for plotting
+        """
+        return {**self._open_set, **self._reverse_open_set}
+
+    @property
+    def closed_set(self) -> dict[tuple[int, int], Node]:
+        """
+        Both searches' expanded cells, for plotting
+        """
+        return {**self._closed_set, **self._reverse_closed_set}
+
+    def reset(self) -> None:
+        super().reset()
+
+        # the reverse search's start_to_node_cost is the cost to the goal
+        self._reverse_open_set: OpenSet = OpenSet()
+        self._reverse_closed_set: dict[tuple[int, int], Node] = {}
+
+    def potential(self, node: Node) -> float:
+        """
+        Forward search heuristic, the reverse search's is
+        start.distance_to(goal) - potential(node). Offset so the start's is
+        its distance to the goal like AStar.
+        """
+        return (
+            node.distance_to(self.goal) - node.distance_to(self.start) +
+            self.start.distance_to(self.goal)
+        ) / 2
+
+    def add_neighbors_to_open_set(
+        self,
+        open_set: OpenSet,
+        closed_set: dict[tuple[int, int], Node],
+        other_open_set: OpenSet,
+        other_closed_set: dict[tuple[int, int], Node],
+        forward: bool
+    ) -> None:
+        """
+        Adds neighbors of the current node to one search's open set, and
+        notes the cheapest path through any neighbor the other search has
+        already reached
+        """
+        # instead of nested loops, we define a list of valid moves in cells
+        diagonal_moves = [
+            (-1, -1),  # left bottom
+            (-1, 1),   # left top
+            (1, -1),   # right bottom
+            (1, 1),    # right top
+        ]
+
+        move_list = [
+            (-1, 0),   # left center
+            (0, -1),   # center bottom
+            (0, 1),    # center top
+            (1, 0),    # right center
+        ]
+
+        if self.do_diagonals:
+            move_list += diagonal_moves
+
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
+        for move in move_list:
+            neighbor_cell: tuple[int, int] = (
+                current_cell[0] + move[0], current_cell[1] + move[1]
+            )
+            if neighbor_cell in closed_set or not self.grid.cell_is_valid(neighbor_cell):
+                continue
+
+            # the reverse search reaches the start itself rather than its
+            # cell's center, like AStar's first step from the start
+            if not forward and neighbor_cell == self._start_cell:
+                neighbor: Node = Node(
+                    self.start.x, self.start.y, parent=self._current_node
+                )
+            else:
+                neighbor: Node = self.grid.node_at(
+                    neighbor_cell, parent=self._current_node
+                )
+            neighbor.start_to_node_cost = (
+                self._current_node.start_to_node_cost +
+                neighbor.distance_to(self._current_node)
+            )
+            neighbor.heuristic_cost = (
+                self.potential(neighbor) if forward else
+                self.start.distance_to(self.goal) - self.potential(neighbor)
+            )
+
+            if (
+                neighbor_cell in open_set and
+                neighbor.total_cost >= open_set[neighbor_cell].total_cost
+            ):
+                continue
+            open_set[neighbor_cell] = neighbor
+
+            # the other search reached this cell too
+            other: Node = other_closed_set.get(
+                neighbor_cell, other_open_set.get(neighbor_cell)
+            )
+            if other:
+                cost: float = neighbor.start_to_node_cost + other.start_to_node_cost
+                if cost < self._best_cost:
+                    self._best_cost = cost
+                    self._meeting = (neighbor, other) if forward else (other, neighbor)
+
+    def find_path(self) -> None:
+        # the reverse search starts from the goal's cell, costed like AStar's
+        # final step from that cell to the goal
+        start_cell: tuple[int, int] = self.grid.cell_of(self.start)
+        goal_cell: tuple[int, int] = self.grid.cell_of(self.goal)
+        self._start_cell: tuple[int, int] = start_cell
+        if start_cell != goal_cell and not self.grid.cell_is_valid(goal_cell):
+            # AStar would never reach it either
+            raise ValueError("No path found")
+
+        goal_cell_node: Node = self.grid.node_at(goal_cell)
+        goal_cell_node.start_to_node_cost = goal_cell_node.distance_to(self.goal)
+        goal_cell_node.heuristic_cost = (
+            self.start.distance_to(self.goal) - self.potential(goal_cell_node)
+        )
+
+        # initialize open sets with the start node and the goal cell
+        self.start.heuristic_cost = self.potential(self.start)
+        self._open_set[start_cell] = self.start
+        self._reverse_open_set[goal_cell] = goal_cell_node
+
+        # cheapest complete path seen so far, through (forward node, reverse
+        # node), a start in the goal's cell goes straight to the goal like
+        # AStar
+        self._best_cost: float = float("inf")
+        self._meeting: tuple[Node, Node] = None
+        if start_cell == goal_cell:
+            self._best_cost = self.start.distance_to(self.goal)
+            self._meeting = (self.start, None)
+
+        # p_reverse(goal) in the stopping rule
+        goal_potential: float = self.start.distance_to(self.goal)
+
+        while self._open_set and self._reverse_open_set:
+            top_forward: float = self._open_set.peek().total_cost
+            top_reverse: float = self._reverse_open_set.peek().total_cost
+            if top_forward + top_reverse >= self._best_cost + goal_potential:
+                break
+
+            # expand the smaller frontier
+            forward: bool = len(self._open_set) <= len(self._reverse_open_set)
+            if forward:
+                open_set, closed_set = self._open_set, self._closed_set
+                other_open_set, other_closed_set = (
+                    self._reverse_open_set, self._reverse_closed_set
+                )
+            else:
+                open_set, closed_set = self._reverse_open_set, self._reverse_closed_set
+                other_open_set, other_closed_set = (
+                    self._open_set, self._closed_set
+                )
+
+            current_cell, self._current_node = open_set.pop()
+            closed_set[current_cell] = self._current_node
+            self.add_neighbors_to_open_set(
+                open_set, closed_set, other_open_set, other_closed_set, forward
+            )
+
+        if not self._meeting:
+            raise ValueError("No path found")
+
+        # hang the reverse chain off the forward chain, so every parent points
+        # back towards the start
+        forward_node, reverse_node = self._meeting
+        reverse_chain: list[Node] = []
+        while reverse_node:
+            reverse_chain.append(reverse_node)
+            reverse_node = reverse_node.parent
+        if reverse_chain and reverse_chain[0] == forward_node:
+            reverse_chain.pop(0)
+
+        parent: Node = forward_node
+        for node in reverse_chain:
+            node.start_to_node_cost = (
+                parent.start_to_node_cost + parent.distance_to(node)
+            )
+            node.heuristic_cost = 0
+            node.parent = parent
+            parent = node
+
+        # update goal cost and parent with the goal cell's node
+        self.goal.start_to_node_cost = (
+            parent.start_to_node_cost + parent.distance_to(self.goal)
+        )
+        self.goal.parent = parent
+
+        # get path, looping backwards through the parents
+        self._path = [self.goal]
+        while self._path[-1] != self.start:
+            self._path.append(self._path[-1].parent)
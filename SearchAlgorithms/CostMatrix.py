@@ -0,0 +1,129 @@
+from __future__ import annotations
+from multiprocessing import Pool
+import numpy as np
+
+from BatchPlanner import PlannedPath
+from Dijkstra import Dijkstra
+from Grid import Grid
+from Node import Node
+from Stopwatch import Stopwatch
+
+# set in each worker by _init_worker, like BatchPlanner
+_worker_grid: Grid = None
+
+def _init_worker(grid: Grid) -> None:
+    global _worker_grid
+    _worker_grid = grid
+
+def _solve_row(
+    job: tuple[int, list[tuple[float, float]]]
+) -> list[PlannedPath]:
+    """
+    Runs one Dijkstra tree from waypoint i that stops once every later
+    waypoint is settled, the earlier ones are covered by their own rows
+    """
+    i, waypoints = job
+    start: Node = Node(*waypoints[i])
+    goals: list[Node] = [Node(*waypoint) for waypoint in waypoints[i + 1:]]
+
+    planned_paths: list[PlannedPath] = []
+    if not goals:
+        return planned_paths
+
+    dijkstra: Dijkstra = Dijkstra(
+        start=start, goal=None, grid=_worker_grid, mode="tree", targets=goals
+    )
+    stopwatch: Stopwatch = Stopwatch()
+    stopwatch.start()
+    dijkstra.find_path()
+    stopwatch.stop()
+
+    for goal in goals:
+        try:
+            path: list[Node] = dijkstra.path_to(goal)
+            planned_paths.append(PlannedPath(
+                start=(start.x, start.y),
+                goal=(goal.x, goal.y),
+                x=[node.x for node in path],
+                y=[node.y for node in path],
+                cost=path[0].total_cost,
+                time=stopwatch.elapsed_time
+            ))
+
+        except ValueError as error:
+            planned_paths.append(PlannedPath(
+                start=(start.x, start.y),
+                goal=(goal.x, goal.y),
+                time=stopwatch.elapsed_time,
+                error=str(error)
+            ))
+
+    return planned_paths
+
+class CostMatrix:
+    def __init__(
+        self, grid: Grid, waypoints: list[Node], processes: int=None
+    ) -> None:
+        """
+        Builds the pairwise path costs between waypoints, like a TSP cost
+        matrix. Grid costs are symmetric, so each waypoint runs one Dijkstra
+        tree that covers every later waypoint and the lower triangle is
+        mirrored from the upper one.
+
+        :param grid: grid shared read only by every search
+        :param waypoints: waypoints, their order is the matrix's order
+        :param processes: worker count, None for one per cpu, 1 runs the
+            searches in this process
+        """
+        self.grid = grid
+        self.waypoints = waypoints
+        self.processes = processes
+
+        self.stopwatch: Stopwatch = Stopwatch()
+
+    def build(self) -> tuple[np.ndarray, dict[tuple[int, int], PlannedPath]]:
+        """
+        Finds the path between every pair of waypoints
+
+        :return: (costs, paths), costs[i, j] is the cost from waypoint i to j,
+            inf if there is no path, and paths[i, j] its planned path, goal
+            first like PathFinder.path
+        """
+        waypoints: list[tuple[float, float]] = [
+            (waypoint.x, waypoint.y) for waypoint in self.waypoints
+        ]
+        jobs: list[tuple[int, list[tuple[float, float]]]] = [
+            (i, waypoints) for i in range(len(waypoints))
+        ]
+
+        self.stopwatch.start()
+        if self.processes == 1:
+            _init_worker(self.grid)
+            rows: list[list[PlannedPath]] = [_solve_row(job) for job in jobs]
+
+        else:
+            with Pool(
+                processes=self.processes,
+                initializer=_init_worker,
+                initargs=(self.grid,)
+            ) as pool:
+                rows: list[list[PlannedPath]] = pool.map(_solve_row, jobs)
+        self.stopwatch.stop()
+
+        costs: np.ndarray = np.zeros((len(waypoints), len(waypoints)))
+        paths: dict[tuple[int, int], PlannedPath] = {}
+        for i, row in enumerate(rows):
+            for j, planned_path in enumerate(row, start=i + 1):
+                costs[i, j] = costs[j, i] = planned_path.cost
+                paths[i, j] = planned_path
+                paths[j, i] = PlannedPath(
+                    start=planned_path.goal,
+                    goal=planned_path.start,
+                    x=planned_path.x[::-1],
+                    y=planned_path.y[::-1],
+                    cost=planned_path.cost,
+                    time=planned_path.time,
+                    error=planned_path.error
+                )
+
+        return costs, paths
@@ -0,0 +1,320 @@
+from __future__ import annotations
+import heapq
+import math
+import numpy as np
+
+from Grid import Grid
+from Node import Node
+from PathFinder import PathFinder
+
+class DStarLite(PathFinder):
+    def __init__(self, start: Node, goal: Node, grid: Grid) -> None:
+        """
+        D* Lite, searches from the goal back to the start and keeps its search
+        between calls to find_path. When cells were blocked or freed on the
+        grid (see Grid.set_cells_blocked) or the start moved since the last
+        call, only the cells whose cost changed are searched again. Same moves
+        and costs as AStar.
+
+        g is a cell's cost to the goal as of its last expansion, rhs the cost
+        through its cheapest neighbor's g. Cells where they differ are queued
+        on key (min(g, rhs) + distance to start + km, min(g, rhs)), km grows
+        by how far the start moved so the old keys stay valid lower bounds.
+        """
+        super().__init__(start, goal, grid)
+
+    @property
+    def open_set(self) -> dict[tuple[int, int], Node]:
+        """
+        Queued cells, for plotting
+        """
+        return {
+            cell: self.grid.node_at(cell, start_to_node_cost=key[1])
+            for cell, key in self._queued.items()
+        }
+
+    def reset(self) -> None:
+        super().reset()
+
+        self._g: dict[tuple[int, int], float] = {}
+        self._rhs: dict[tuple[int, int], float] = {}
+
+        # heap of (key, cell), a cell's entry is stale once its key in
+        # _queued changed or it was dequeued, like OpenSet's lazy deletion
+        self._queue: list[tuple[tuple[float, float], tuple[int, int]]] = []
+        self._queued: dict[tuple[int, int], tuple[float, float]] = {}
+        self._km: float = 0.0
+
+        # what the search was last run against, None before the first search
+        self._last_start: Node = None
+        self._goal_cell: tuple[int, int] = None
+        self._occupancy: np.ndarray = None
+        self._cell_offset: tuple[int, int] = None
+
+        # (dx, dy, cost) of each move
+        moves: list[tuple[int, int]] = [(-1, 0), (0, -1), (0, 1), (1, 0)]
+        if self.do_diagonals:
+            moves += [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+        self._moves: list[tuple[int, int, float]] = [
+            (dx, dy, math.hypot(dx, dy) * self.grid.grid_spacing)
+            for dx, dy in moves
+        ]
+
+    def set_free_cells(self) -> None:
+        """
+        Copies the occupancy into _free, padded with a blocked border so a
+        cell's neighbors never need a bounds check, lists because single
+        lookups are faster than NumPy, like JumpPointSearch
+        """
+        self._free: list[list[bool]] = np.pad(
+            ~self.grid._occupancy, 1, constant_values=False
+        ).tolist()
+        self._x_offset: int = self.grid._cell_offset[0] - 1
+        self._y_offset: int = self.grid._cell_offset[1] - 1
+
+    def is_free(self, cell: tuple[int, int]) -> bool:
+        ix: int = cell[0] - self._x_offset
+        iy: int = cell[1] - self._y_offset
+        return (
+            0 <= ix < len(self._free) and 0 <= iy < len(self._free[0]) and
+            self._free[ix][iy]
+        )
+
+    def neighbors_of(
+        self, cell: tuple[int, int]
+    ) -> list[tuple[tuple[int, int], float]]:
+        """
+        Valid cells one move away, cell must be in bounds
+
+        :return: (neighboring cell, move cost) pairs
+        """
+        x, y = cell
+        free: list[list[bool]] = self._free
+        return [
+            ((x + dx, y + dy), cost) for dx, dy, cost in self._moves
+            if free[x + dx - self._x_offset][y + dy - self._y_offset]
+        ]
+
+    def distance(self, cell: tuple[int, int], node: Node) -> float:
+        return math.hypot(
+            cell[0] * self.grid.grid_spacing - node.x,
+            cell[1] * self.grid.grid_spacing - node.y
+        )
+
+    def key_of(self, cell: tuple[int, int]) -> tuple[float, float]:
+        cost: float = min(
+            self._g.get(cell, math.inf), self._rhs.get(cell, math.inf)
+        )
+        return (cost + self.distance(cell, self.start) + self._km, cost)
+
+    def lookahead_cost(self, cell: tuple[int, int]) -> float:
+        """
+        Cost to the goal through the cheapest neighbor, the goal's cell steps
+        straight to the goal like AStar's last step
+
+        :return: rhs of the cell, inf if it's blocked
+        """
+        if not self.is_free(cell):
+            return math.inf
+        if cell == self._goal_cell:
+            return self.distance(cell, self.goal)
+
+        g: dict[tuple[int, int], float] = self._g
+        return min(
+            (
+                cost + g.get(neighbor, math.inf)
+                for neighbor, cost in self.neighbors_of(cell)
+            ),
+            default=math.inf
+        )
+
+    def start_cost(self) -> float:
+        """
+        Cost from the start to the goal, the start steps from where it is to
+        its cell's neighbors like AStar
+
+        :return: cost, inf if there is no path yet
+        """
+        if self.grid.cell_of(self.start) == self._goal_cell:
+            return self.start.distance_to(self.goal)
+
+        g: dict[tuple[int, int], float] = self._g
+        return min(
+            (
+                cost + g.get(neighbor, math.inf)
+                for neighbor, cost in self._start_moves
+            ),
+            default=math.inf
+        )
+
+    def update_cell(self, cell: tuple[int, int]) -> None:
+        """
+        Recomputes a cell's rhs and queues it if it's inconsistent
+        """
+        self._rhs[cell] = self.lookahead_cost(cell)
+        self.queue_cell(cell)
+
+    def queue_cell(self, cell: tuple[int, int]) -> None:
+        """
+        Queues a cell if its g and rhs differ, dequeues it otherwise
+        """
+        if self._g.get(cell, math.inf) != self._rhs.get(cell, math.inf):
+            key: tuple[float, float] = self.key_of(cell)
+            self._queued[cell] = key
+            heapq.heappush(self._queue, (key, cell))
+        else:
+            self._queued.pop(cell, None)
+
+    def _drop_stale(self) -> None:
+        """
+        Pops queue entries whose cell was requeued or dequeued off the top
+        """
+        while (
+            self._queue and
+            self._queued.get(self._queue[0][1]) != self._queue[0][0]
+        ):
+            heapq.heappop(self._queue)
+
+    def compute_shortest_path(self) -> None:
+        """
+        Expands queued cells until the start's cost can't change
+        """
+        while True:
+            self._drop_stale()
+            if not self._queue:
+                break
+
+            # cells on a straight line from the start tie with it on the
+            # first key, and float error can order them either side of it, so
+            # every tied cell is expanded instead of trusting the second key
+            start_cost: float = self.start_cost()
+            old_key, cell = self._queue[0]
+            if old_key[0] > start_cost + self._km + 1e-9:
+                break
+
+            new_key: tuple[float, float] = self.key_of(cell)
+            if old_key < new_key:
+                # queued before the start moved
+                self._queued[cell] = new_key
+                heapq.heappush(self._queue, (new_key, cell))
+                continue
+
+            heapq.heappop(self._queue)
+            del self._queued[cell]
+            self._closed_set[cell] = self.grid.node_at(
+                cell, start_to_node_cost=self._rhs[cell]
+            )
+
+            # got cheaper, settle it, a neighbor's rhs can only drop to its
+            # cost through this cell
+            g: float = self._g.get(cell, math.inf)
+            if g > self._rhs[cell]:
+                g = self._g[cell] = self._rhs[cell]
+                for neighbor, cost in self.neighbors_of(cell):
+                    if cost + g < self._rhs.get(neighbor, math.inf):
+                        self._rhs[neighbor] = cost + g
+                        self.queue_cell(neighbor)
+
+            # got more expensive, reopen it, only the neighbors whose rhs went
+            # through this cell need theirs recomputed
+            else:
+                self._g[cell] = math.inf
+                self.update_cell(cell)
+                for neighbor, cost in self.neighbors_of(cell):
+                    if self._rhs.get(neighbor) == cost + g:
+                        self.update_cell(neighbor)
+
+    def update_changed_cells(self) -> None:
+        """
+        Requeues the cells whose occupancy changed since the last search and
+        their neighbors
+        """
+        changed: np.ndarray = (
+            np.argwhere(self._occupancy != self.grid._occupancy) +
+            self._cell_offset
+        )
+        for ix, iy in changed.tolist():
+            self._free[ix - self._x_offset][iy - self._y_offset] = (
+                self.grid.cell_is_valid((ix, iy))
+            )
+
+        for ix, iy in changed.tolist():
+            self.update_cell((ix, iy))
+
+            # a blocked cell isn't a valid neighbor, so its neighbors are
+            # found by offset instead of neighbors_of
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if dx or dy:
+                        self.update_cell((ix + dx, iy + dy))
+
+    def find_path(self) -> None:
+        """
+        The first call searches from scratch, later calls repair the previous
+        search for grid changes and a moved start. A moved goal or resized
+        grid starts from scratch.
+        """
+        goal_cell: tuple[int, int] = self.grid.cell_of(self.goal)
+        if (
+            self._occupancy is None or
+            goal_cell != self._goal_cell or
+            self._occupancy.shape != self.grid._occupancy.shape or
+            self._cell_offset != self.grid._cell_offset
+        ):
+            if self._occupancy is not None:
+                self.reset()
+            self.set_free_cells()
+            self._goal_cell = goal_cell
+            self.update_cell(goal_cell)
+
+        else:
+            # the keys were made with the distances to the old start, which
+            # are at most this much too big now
+            self._km += self._last_start.distance_to(self.start)
+            self.update_changed_cells()
+
+        self._last_start = Node(self.start.x, self.start.y)
+        self._occupancy = self.grid._occupancy.copy()
+        self._cell_offset = self.grid._cell_offset
+
+        # the start steps from where it is to its cell's neighbors like AStar
+        start_cell: tuple[int, int] = self.grid.cell_of(self.start)
+        self._start_moves: list[tuple[tuple[int, int], float]] = []
+        for dx, dy, _cost in self._moves:
+            neighbor: tuple[int, int] = (start_cell[0] + dx, start_cell[1] + dy)
+            if self.is_free(neighbor):
+                self._start_moves.append(
+                    (neighbor, self.distance(neighbor, self.start))
+                )
+
+        self._closed_set = {}
+        self.compute_shortest_path()
+
+        if self.start_cost() == math.inf:
+            raise ValueError("No path found")
+
+        # walk down the g values from the start to the goal's cell, only
+        # through consistent cells, a queued cell's g can be out of date
+        nodes: list[Node] = [self.start]
+        moves: list[tuple[tuple[int, int], float]] = self._start_moves
+        cell: tuple[int, int] = start_cell
+        while cell != goal_cell:
+            cell, _cost = min(
+                (move for move in moves if move[0] not in self._queued),
+                key=lambda move: move[1] + self._g.get(move[0], math.inf)
+            )
+            nodes.append(self.grid.node_at(cell))
+            moves = self.neighbors_of(cell)
+        nodes.append(self.goal)
+
+        # update costs and parents from the start
+        self.start.parent = None
+        self.start.start_to_node_cost = 0
+        for parent, node in zip(nodes, nodes[1:]):
+            node.parent = parent
+            node.start_to_node_cost = (
+                parent.start_to_node_cost + parent.distance_to(node)
+            )
+
+        # goal first, like the other path finders
+        self._path = nodes[::-1]
@@ -6,36 +6,57 @@ from Node import Node
 from PathFinder import PathFinder
 
 class Dijkstra(PathFinder):
-    def __init__(self, start: Node, goal: Node, grid: Grid) -> None:
+    def __init__(
+        self, 
+        start: Node, 
+        goal: Node, 
+        grid: Grid, 
+        mode: str="goal", 
+        targets: list[Node]=None
+    ) -> None:
+        """
+        :param mode: "goal" stops as soon as the goal is settled, "tree" runs 
+            until the open set is empty and keeps the full shortest path tree 
+            so any goal can be answered afterwards with path_to and cost_to
+        :param targets: in tree mode, stop as soon as all of these are settled
+            instead of settling every reachable node
+        """
+        if mode not in ("goal", "tree"):
+            raise ValueError(f"Unknown Dijkstra mode: {mode}")
+        self.mode = mode
+        self.targets = targets
+
         super().__init__(start, goal, grid)
 
     def add_neighbors_to_open_set(self):
         """
         Adds neighbors of the current node to open set.
         """
-        # instead of nested loops, we define a list of valid moves
+        # instead of nested loops, we define a list of valid moves in cells
         diagonal_moves = [
-            (-self.grid.grid_spacing, -self.grid.grid_spacing),  # left bottom
-            (-self.grid.grid_spacing, self.grid.grid_spacing),   # left top
-            (self.grid.grid_spacing, -self.grid.grid_spacing),   # right bottom
-            (self.grid.grid_spacing, self.grid.grid_spacing),    # right top
+            (-1, -1),  # left bottom
+            (-1, 1),   # left top
+            (1, -1),   # right bottom
+            (1, 1),    # right top
         ]
 
         move_list = [
-            (-self.grid.grid_spacing, 0),                        # left center
-            (0, -self.grid.grid_spacing),                        # center bottom
-            (0, self.grid.grid_spacing),                         # center top
-            (self.grid.grid_spacing, 0),                         # right center
+            (-1, 0),   # left center
+            (0, -1),   # center bottom
+            (0, 1),    # center top
+            (1, 0),    # right center
         ]
 
         if self.do_diagonals:
             move_list += diagonal_moves
 
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
         for move in move_list:
-            neighbor: Node = Node(
-                x=self._current_node.x + move[0],
-                y=self._current_node.y + move[1],
-                parent=self._current_node
+            neighbor_cell: tuple[int, int] = (
+                current_cell[0] + move[0], current_cell[1] + move[1]
+            )
+            neighbor: Node = self.grid.node_at(
+                neighbor_cell, parent=self._current_node
             )
 
             if not self.grid.node_is_valid(neighbor):
@@ -47,38 +68,90 @@ class Dijkstra(PathFinder):
             )
 
             # if we've already noted this neighbor
-            if neighbor.id in self._open_set:
+            if neighbor_cell in self._open_set:
                 # if its cost got cheaper
-                if neighbor.total_cost < self._open_set[neighbor.id].total_cost:
-                    self._open_set[neighbor.id] = neighbor
+                if neighbor.total_cost < self._open_set[neighbor_cell].total_cost:
+                    self._open_set[neighbor_cell] = neighbor
 
             # brand new neighbor
-            elif neighbor.id not in self._closed_set:
-                self._open_set[neighbor.id] = neighbor
+            elif neighbor_cell not in self._closed_set:
+                self._open_set[neighbor_cell] = neighbor
         
 
     def find_path(self) -> None:
+        goal_cell: tuple[int, int] = (
+            self.grid.cell_of(self.goal) if self.goal else None
+        )
+
+        target_cells: set[tuple[int, int]] = (
+            {self.grid.cell_of(target) for target in self.targets}
+            if self.targets else set()
+        )
+
         # initialize open set with start node
-        self._open_set[self.start.id] = self.start
+        self._open_set[self.grid.cell_of(self.start)] = self.start
 
-        # while we are not at the goal
+        # while there are nodes to visit
         while self._open_set:
             # get node from open set with smallest total cost
-            self._current_node = min(
-                self._open_set.values(),
-                key=lambda node: node.total_cost
-            )
+            current_cell, self._current_node = self._open_set.pop()
+
+            # add current node to closed set
+            self._closed_set[current_cell] = self._current_node
+
+            # the goal's cost is final once it's settled
+            if self.mode == "goal" and current_cell == goal_cell:
+                break
+
+            # the tree is only needed as far as the last target
+            if target_cells:
+                target_cells.discard(current_cell)
+                if not target_cells:
+                    break
 
             # add neighbors to open set
             self.add_neighbors_to_open_set()
 
-            # remove current node from open set
-            del self._open_set[self._current_node.id]
+        if self.goal:
+            self._path = self.path_to(self.goal)
 
-            # add current node to closed set
-            self._closed_set[self._current_node.id] = self._current_node
+    def cost_to(self, goal: Node) -> float:
+        """
+        Cost from start to a settled goal's cell plus the last step from the
+        cell to the goal, in tree mode any reachable node is settled after
+        find_path
 
-        # get path, looping backwards through the parents
-        self._path = [self._closed_set[self.goal.id]]
-        while self._path[-1] != self.start:
-            self._path.append(self._path[-1].parent)
\ No newline at end of file
+        :param goal: node to get the cost to
+        :return: start to goal cost
+        """
+        goal_cell: tuple[int, int] = self.grid.cell_of(goal)
+        if goal_cell not in self._closed_set:
+            raise ValueError(f"No path found to {goal.id}")
+        cell_node: Node = self._closed_set[goal_cell]
+        return cell_node.start_to_node_cost + cell_node.distance_to(goal)
+
+    def path_to(self, goal: Node) -> list[Node]:
+        """
+        Path from start to a settled goal, looping backwards through the 
+        parents
+
+        :param goal: node to get the path to, its cost and parent are updated
+            like AStar's goal
+        :return: path, goal first
+        """
+        goal_cell: tuple[int, int] = self.grid.cell_of(goal)
+        if goal_cell not in self._closed_set:
+            raise ValueError(f"No path found to {goal.id}")
+
+        # update goal cost and parent with its cell's node, the goal may be
+        # off the cell's center
+        cell_node: Node = self._closed_set[goal_cell]
+        goal.start_to_node_cost = (
+            cell_node.start_to_node_cost + cell_node.distance_to(goal)
+        )
+        goal.parent = cell_node
+
+        path: list[Node] = [goal]
+        while path[-1] != self.start:
+            path.append(path[-1].parent)
+        return path
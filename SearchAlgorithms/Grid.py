@@ -1,4 +1,5 @@
 from __future__ import annotations
+import math
 import numpy as np
 import random
 
@@ -22,17 +23,61 @@ class Grid:
         self.grid_spacing = grid_spacing
         self.obstacles = obstacles
 
-        self._valid_nodes: dict[str, Node] = {}
-        self._invalid_nodes: dict[str, Node] = {}
+        # nodes are only created when asked for, see valid_nodes
+        self._valid_nodes: dict[tuple[int, int], Node] = None
+        self._invalid_nodes: dict[tuple[int, int], Node] = None
+
+        # occupancy[ix, iy] is True when the cell is blocked, indexed relative 
+        # to the first in bound cell, _cell_offset
+        self._occupancy: np.ndarray = np.ones((0, 0), dtype=bool)
+        self._cell_offset: tuple[int, int] = (0, 0)
+
+        # bumped whenever the occupancy changes, so planners know when their
+        # copies of it are stale
+        self._version: int = 0
 
     @property
-    def nodes(self) -> dict[str, Node]:
+    def nodes(self) -> dict[tuple[int, int], Node]:
         """
         combines the valid and invalid nodes in the grid
 
         :return: combined nodes
         """
-        return {**self._valid_nodes, **self._invalid_nodes}
+        return {**self.valid_nodes, **self.invalid_nodes}
+
+    @property
+    def valid_nodes(self) -> dict[tuple[int, int], Node]:
+        """
+        nodes of the in bound cells that aren't blocked, created on first use
+
+        :return: valid nodes keyed by cell
+        """
+        if self._valid_nodes is None:
+            self._valid_nodes = self._nodes_where(~self._occupancy)
+        return self._valid_nodes
+
+    @property
+    def invalid_nodes(self) -> dict[tuple[int, int], Node]:
+        """
+        nodes of the in bound cells blocked by obstacles, created on first use
+
+        :return: invalid nodes keyed by cell
+        """
+        if self._invalid_nodes is None:
+            self._invalid_nodes = self._nodes_where(self._occupancy)
+        return self._invalid_nodes
+
+    def _nodes_where(self, mask: np.ndarray) -> dict[tuple[int, int], Node]:
+        """
+        Creates nodes for the cells where mask is True
+
+        :param mask: boolean array shaped like the occupancy array
+        :return: nodes keyed by cell
+        """
+        cells: np.ndarray = np.argwhere(mask) + self._cell_offset
+        return {
+            (ix, iy): self.node_at((ix, iy)) for ix, iy in cells.tolist()
+        }
 
     def inflate_obstacles(self, inflation_amount: float):
         """
@@ -54,6 +99,52 @@ class Grid:
         self.min_y += self.grid_spacing * round(inflation_amount / self.grid_spacing)
         self.max_y -= self.grid_spacing * round(inflation_amount / self.grid_spacing)
 
+    def cell_of(self, node: Node) -> tuple[int, int]:
+        """
+        Gets the integer lattice cell a node falls in, cells are spaced 
+        grid_spacing apart starting from the origin, same as snap_node_to_grid
+
+        :param node: node to locate
+        :return: (ix, iy) cell indices
+        """
+        return (
+            round(node.x / self.grid_spacing), 
+            round(node.y / self.grid_spacing)
+        )
+
+    def node_at(self, cell: tuple[int, int], **kwargs) -> Node:
+        """
+        Creates a node at the center of a cell
+
+        :param cell: (ix, iy) cell indices
+        :return: node at the cell
+        """
+        return Node(
+            x=cell[0] * self.grid_spacing, 
+            y=cell[1] * self.grid_spacing, 
+            **kwargs
+        )
+
+    def cell_range(self) -> tuple[range, range]:
+        """
+        Gets the ranges of cell indices inside the bounds of the grid
+
+        :return: (x cell indices, y cell indices)
+        """
+        # small tolerance so bounds that are multiples of the spacing don't 
+        # lose their edge cells to float error
+        tolerance: float = 1e-9
+        return (
+            range(
+                math.ceil(self.min_x / self.grid_spacing - tolerance),
+                math.floor(self.max_x / self.grid_spacing + tolerance) + 1
+            ),
+            range(
+                math.ceil(self.min_y / self.grid_spacing - tolerance),
+                math.floor(self.max_y / self.grid_spacing + tolerance) + 1
+            )
+        )
+
     def node_in_bounds(self, node: Node) -> bool:
         """
         Checks if a node is in the bounds of the grid
@@ -66,24 +157,140 @@ class Grid:
             and self.min_y <= node.y <= self.max_y
         )
 
+    def cell_in_bounds(self, cell: tuple[int, int]) -> bool:
+        """
+        Checks if a cell is in the bounds of the grid
+
+        :param cell: (ix, iy) cell indices
+        :return: True if the cell is in the bounds of the grid, False otherwise
+        """
+        return (
+            0 <= cell[0] - self._cell_offset[0] < self._occupancy.shape[0] and
+            0 <= cell[1] - self._cell_offset[1] < self._occupancy.shape[1]
+        )
+
     def node_in_obstacle(self, node: Node) -> bool:
-        if node.id in self._invalid_nodes:
-            # invalid_node could be an obstacle's bounding box or 
-            # node outside of the grid
-            invalid_node: Node = self._invalid_nodes[node.id]
+        """
+        Checks if a node falls in a cell blocked by an obstacle, only cells in
+        the bounds of the grid are rasterized
+
+        :param node: node to check
+        :return: True if the node's cell is blocked, False otherwise
+        """
+        cell: tuple[int, int] = self.cell_of(node)
+        return self.cell_in_bounds(cell) and bool(self._occupancy[
+            cell[0] - self._cell_offset[0], cell[1] - self._cell_offset[1]
+        ])
+
+    def cell_is_valid(self, cell: tuple[int, int]) -> bool:
+        """
+        Checks if a cell is in bounds and not blocked using the occupancy array
+
+        :param cell: (ix, iy) cell indices
+        :return: True if the cell is valid, False otherwise
+        """
+        ix: int = cell[0] - self._cell_offset[0]
+        iy: int = cell[1] - self._cell_offset[1]
+        return (
+            0 <= ix < self._occupancy.shape[0] and
+            0 <= iy < self._occupancy.shape[1] and
+            not self._occupancy[ix, iy]
+        )
+
+    def cells_are_valid(self, ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+        """
+        Vectorized cell_is_valid for a batch of cells
+
+        :param ix: x cell indices
+        :param iy: y cell indices
+        :return: boolean array, True where the cell is valid
+        """
+        ix = np.asarray(ix, dtype=int) - self._cell_offset[0]
+        iy = np.asarray(iy, dtype=int) - self._cell_offset[1]
+        in_bounds: np.ndarray = (
+            (0 <= ix) & (ix < self._occupancy.shape[0]) &
+            (0 <= iy) & (iy < self._occupancy.shape[1])
+        )
+        valid: np.ndarray = np.zeros(in_bounds.shape, dtype=bool)
+        valid[in_bounds] = ~self._occupancy[ix[in_bounds], iy[in_bounds]]
+        return valid
+
+    def points_are_valid(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Snaps a batch of points to the grid and checks if they are valid
+
+        :param x: x coordinates
+        :param y: y coordinates
+        :return: boolean array, True where the point is valid
+        """
+        return self.cells_are_valid(
+            np.rint(np.asarray(x) / self.grid_spacing),
+            np.rint(np.asarray(y) / self.grid_spacing)
+        )
 
-            # check if invalid node has a parent
-            if invalid_node.parent:
+    def segment_is_valid(self, start: Node, stop: Node) -> bool:
+        """
+        Checks every cell the segment from start to stop passes through, 
+        walking them in order from start (Amanatides-Woo) and returning at the
+        first invalid one. Cell i covers [i - 0.5, i + 0.5) grid spacings. A
+        segment passing exactly through a cell corner only touches the side 
+        cells, so like a diagonal move it goes straight to the diagonal cell.
+
+        :param start: segment start
+        :param stop: segment stop
+        :return: True if every cell on the segment is valid, False otherwise
+        """
+        x0: float = start.x / self.grid_spacing + 0.5
+        y0: float = start.y / self.grid_spacing + 0.5
+        x1: float = stop.x / self.grid_spacing + 0.5
+        y1: float = stop.y / self.grid_spacing + 0.5
+
+        ix, iy = math.floor(x0), math.floor(y0)
+        end_ix, end_iy = math.floor(x1), math.floor(y1)
+        if not self.cell_is_valid((ix, iy)):
+            return False
+
+        # t is the fraction of the segment travelled, t_max the t at which 
+        # the next cell boundary is crossed and t_delta the t between them
+        step_x: int = 1 if x1 > x0 else -1
+        step_y: int = 1 if y1 > y0 else -1
+        t_delta_x: float = 1 / abs(x1 - x0) if x1 != x0 else math.inf
+        t_delta_y: float = 1 / abs(y1 - y0) if y1 != y0 else math.inf
+        t_max_x: float = (
+            (ix + 1 - x0 if step_x > 0 else x0 - ix) * t_delta_x
+            if x1 != x0 else math.inf
+        )
+        t_max_y: float = (
+            (iy + 1 - y0 if step_y > 0 else y0 - iy) * t_delta_y
+            if y1 != y0 else math.inf
+        )
+
+        # the walk can't take more steps than this, guards against float error
+        # stepping past the end cell
+        steps_left: int = abs(end_ix - ix) + abs(end_iy - iy)
+        while steps_left > 0 and (ix, iy) != (end_ix, end_iy):
+            # boundaries crossed within float error of each other are a corner
+            if t_max_x < t_max_y - 1e-9:
+                ix += step_x
+                t_max_x += t_delta_x
+                steps_left -= 1
 
-                # if it does, we deduce it's an obstacle's bounding box
-                obstacle: Obstacle = self.obstacles[invalid_node.parent.id]
-                if obstacle.is_point_inside_obstacle(node):
-                    return True
+            elif t_max_y < t_max_x - 1e-9:
+                iy += step_y
+                t_max_y += t_delta_y
+                steps_left -= 1
 
             else:
-                return True
+                ix += step_x
+                iy += step_y
+                t_max_x += t_delta_x
+                t_max_y += t_delta_y
+                steps_left -= 2
+
+            if not self.cell_is_valid((ix, iy)):
+                return False
 
-        return False
+        return True
 
     def node_is_valid(self, node: Node) -> bool:
         """
@@ -92,36 +299,82 @@ class Grid:
         :param node: node to check
         :return: True if the node is valid, False otherwise
         """
-        return (
-            self.node_in_bounds(node) and
-            not self.node_in_obstacle(node)
-        )
+        return self.cell_is_valid(self.cell_of(node))
 
     def set_nodes(self):
         """
-        Sets the valid and invalid nodes in the grid
+        Rasterizes the obstacles into the occupancy array, the valid and 
+        invalid nodes are created from it when they're first asked for
         """
-        for _id, obstacle in self.obstacles.items():
-            obstacle.set_bounding_box(self.grid_spacing)
-
-            self._invalid_nodes[obstacle.id] = obstacle
-            for _id, invalid_node in obstacle._bounding_box.items():
-                self._invalid_nodes[_id] = invalid_node
-
-        # looping in bound nodes
-        for row in np.arange(
-            self.min_x, self.max_x + self.grid_spacing, self.grid_spacing
-        ):
-            for col in np.arange(
-                self.min_y, self.max_y + self.grid_spacing, self.grid_spacing
-            ):
-                node = Node(
-                    x=row,
-                    y=col
-                )
-
-                if node.id not in self._invalid_nodes:
-                    self._valid_nodes[node.id] = node
+        x_cells, y_cells = self.cell_range()
+        self._cell_offset = (x_cells.start, y_cells.start)
+        self._occupancy = np.zeros((len(x_cells), len(y_cells)), dtype=bool)
+
+        blocked_cells: np.ndarray = (
+            Obstacle.rasterize(self.obstacles.values(), self.grid_spacing) - 
+            self._cell_offset
+        )
+        in_bounds: np.ndarray = (
+            (0 <= blocked_cells[:, 0]) & 
+            (blocked_cells[:, 0] < self._occupancy.shape[0]) &
+            (0 <= blocked_cells[:, 1]) & 
+            (blocked_cells[:, 1] < self._occupancy.shape[1])
+        )
+        blocked_cells = blocked_cells[in_bounds]
+        self._occupancy[blocked_cells[:, 0], blocked_cells[:, 1]] = True
+        self._version += 1
+
+        self._valid_nodes = None
+        self._invalid_nodes = None
+
+    def set_cells_blocked(
+        self, cells: list[tuple[int, int]], blocked: bool=True
+    ) -> None:
+        """
+        Blocks or frees cells without rasterizing the obstacles again, for map
+        updates between searches. Cells out of bounds are ignored like
+        obstacles out of bounds in set_nodes.
+
+        :param cells: (ix, iy) cell indices
+        :param blocked: True blocks the cells, False frees them
+        """
+        cells: np.ndarray = (
+            np.asarray(cells, dtype=int).reshape(-1, 2) - self._cell_offset
+        )
+        in_bounds: np.ndarray = (
+            (0 <= cells[:, 0]) & (cells[:, 0] < self._occupancy.shape[0]) &
+            (0 <= cells[:, 1]) & (cells[:, 1] < self._occupancy.shape[1])
+        )
+        cells = cells[in_bounds]
+        self._occupancy[cells[:, 0], cells[:, 1]] = blocked
+        self._version += 1
+
+        self._valid_nodes = None
+        self._invalid_nodes = None
+
+    def random_valid_node(self) -> Node:
+        """
+        Picks a random valid node without creating the rest of them
+
+        :return: node at a random valid cell
+        """
+        cells: np.ndarray = np.argwhere(~self._occupancy)
+        ix, iy = cells[random.randrange(len(cells))].tolist()
+        return self.node_at(
+            (ix + self._cell_offset[0], iy + self._cell_offset[1])
+        )
+
+    def valid_points(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the coordinates of every valid cell center
+
+        :return: (x coordinates, y coordinates)
+        """
+        cells: np.ndarray = np.argwhere(~self._occupancy)
+        return (
+            (cells[:, 0] + self._cell_offset[0]) * self.grid_spacing,
+            (cells[:, 1] + self._cell_offset[1]) * self.grid_spacing
+        )
 
     def snap_node_to_grid(self, node: Node) -> Node:
         """
@@ -0,0 +1,297 @@
+from __future__ import annotations
+import math
+import numpy as np
+
+from Grid import Grid
+from Node import Node
+from PathFinder import PathFinder
+
+class JumpPointSearch(PathFinder):
+    def __init__(
+        self, start: Node, goal: Node, grid: Grid, dense_path: bool=False
+    ) -> None:
+        """
+        A* over jump points only. Moving in a straight line or diagonal, the
+        search skips every cell whose neighbors are all reached at least as
+        cheaply another way, and only stops at cells with a forced neighbor
+        (one only reachable optimally through it) or the goal. Same moves as
+        AStar, diagonals may cut corners, so the path cost is the same.
+
+        :param dense_path: fill the path in with every cell between the jump
+            points, like an AStar path
+        """
+        self.dense_path = dense_path
+        super().__init__(start, goal, grid)
+
+    def reset(self) -> None:
+        super().reset()
+
+        # the free cells are only (re)built when the grid changes
+        if getattr(self, "_grid_version", None) != self.grid._version:
+            self._grid_version: int = self.grid._version
+
+            # padded with a blocked border so a cell's neighbors never need a
+            # bounds check, lists because single lookups are faster than NumPy
+            self._free: list[list[bool]] = np.pad(
+                ~self.grid._occupancy, 1, constant_values=False
+            ).tolist()
+            self._x_offset: int = self.grid._cell_offset[0] - 1
+            self._y_offset: int = self.grid._cell_offset[1] - 1
+
+    def is_free(self, x: int, y: int) -> bool:
+        """
+        :return: False for a blocked cell or one outside the grid
+        """
+        ix: int = x - self._x_offset
+        iy: int = y - self._y_offset
+        return (
+            0 <= ix < len(self._free) and 0 <= iy < len(self._free[0]) and
+            self._free[ix][iy]
+        )
+
+    def _free_at(self, x: int, y: int) -> bool:
+        """
+        is_free without the bounds check, for the jumps, which only step from
+        free cells and stop at the blocked border
+        """
+        return self._free[x - self._x_offset][y - self._y_offset]
+
+    def jump(
+        self, cell: tuple[int, int], direction: tuple[int, int]
+    ) -> tuple[tuple[int, int], int]:
+        """
+        Steps from cell in direction until a jump point, a blocked cell or the
+        goal
+
+        :return: (jump point, steps to it), (None, 0) if the way is blocked
+        """
+        x, y = cell
+        dx, dy = direction
+        is_free = self._free_at
+        steps: int = 0
+        while True:
+            x += dx
+            y += dy
+            steps += 1
+            if not is_free(x, y):
+                return None, 0
+            if (x, y) == self._goal_cell:
+                return (x, y), steps
+
+            if dx and dy:
+                if (
+                    (not is_free(x - dx, y) and is_free(x - dx, y + dy)) or
+                    (not is_free(x, y - dy) and is_free(x + dx, y - dy))
+                ):
+                    return (x, y), steps
+
+                # a diagonal stops where a straight jump would find something
+                if (
+                    self.jump((x, y), (dx, 0))[0] or
+                    self.jump((x, y), (0, dy))[0]
+                ):
+                    return (x, y), steps
+
+            elif dx:
+                if (
+                    (not is_free(x, y + 1) and is_free(x + dx, y + 1)) or
+                    (not is_free(x, y - 1) and is_free(x + dx, y - 1))
+                ):
+                    return (x, y), steps
+
+            elif (
+                (not is_free(x + 1, y) and is_free(x + 1, y + dy)) or
+                (not is_free(x - 1, y) and is_free(x - 1, y + dy))
+            ):
+                return (x, y), steps
+
+    def directions(
+        self, cell: tuple[int, int], parent_cell: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        """
+        Natural and forced neighbor directions of cell when reached from
+        parent_cell, every direction for the start
+
+        :return: (dx, dy) directions to jump in
+        """
+        if parent_cell is None:
+            return [
+                (-1, 0), (0, -1), (0, 1), (1, 0),
+                (-1, -1), (-1, 1), (1, -1), (1, 1)
+            ]
+
+        x, y = cell
+        dx: int = (x > parent_cell[0]) - (x < parent_cell[0])
+        dy: int = (y > parent_cell[1]) - (y < parent_cell[1])
+        is_free = self._free_at
+
+        if dx and dy:
+            directions: list[tuple[int, int]] = [(dx, 0), (0, dy), (dx, dy)]
+            if not is_free(x - dx, y):
+                directions.append((-dx, dy))
+            if not is_free(x, y - dy):
+                directions.append((dx, -dy))
+
+        elif dx:
+            directions: list[tuple[int, int]] = [(dx, 0)]
+            if not is_free(x, y + 1):
+                directions.append((dx, 1))
+            if not is_free(x, y - 1):
+                directions.append((dx, -1))
+
+        else:
+            directions: list[tuple[int, int]] = [(0, dy)]
+            if not is_free(x + 1, y):
+                directions.append((1, dy))
+            if not is_free(x - 1, y):
+                directions.append((-1, dy))
+
+        return directions
+
+    def add_neighbors_to_open_set(self) -> None:
+        """
+        Adds the jump points reachable from the current node to open set
+        """
+        spacing: float = self.grid.grid_spacing
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
+
+        # seeded start neighbors are costed from where the start is, pruning
+        # by the start's cell could miss a cheaper way around them, so they
+        # jump every way like the start
+        parent: Node = self._current_node.parent
+        parent_cell: tuple[int, int] = (
+            self.grid.cell_of(parent)
+            if parent and not (parent is self.start and self._seed_start)
+            else None
+        )
+
+        for direction in self.directions(current_cell, parent_cell):
+            jump_cell, steps = self.jump(current_cell, direction)
+            if not jump_cell or jump_cell in self._closed_set:
+                continue
+
+            jump_point: Node = self.grid.node_at(
+                jump_cell, parent=self._current_node
+            )
+
+            jump_point.start_to_node_cost = (
+                self._current_node.start_to_node_cost +
+                steps * math.hypot(*direction) * spacing
+            )
+            jump_point.heuristic_cost = jump_point.distance_to(self.goal)
+
+            # if we've already noted this jump point
+            if jump_cell in self._open_set:
+                # if its cost got cheaper
+                if jump_point.total_cost < self._open_set[jump_cell].total_cost:
+                    self._open_set[jump_cell] = jump_point
+
+            # brand new jump point
+            else:
+                self._open_set[jump_cell] = jump_point
+
+    def add_start_neighbors_to_open_set(self) -> None:
+        """
+        Adds the valid cells around the start to open set, costed from where
+        the start is like AStar, the jumps start from them
+        """
+        start_cell: tuple[int, int] = self.grid.cell_of(self.start)
+        for direction in self.directions(start_cell, None):
+            neighbor_cell: tuple[int, int] = (
+                start_cell[0] + direction[0], start_cell[1] + direction[1]
+            )
+            if (
+                not self.is_free(*neighbor_cell) or
+                neighbor_cell in self._closed_set
+            ):
+                continue
+
+            neighbor: Node = self.grid.node_at(neighbor_cell, parent=self.start)
+            neighbor.start_to_node_cost = (
+                self.start.start_to_node_cost + neighbor.distance_to(self.start)
+            )
+            neighbor.heuristic_cost = neighbor.distance_to(self.goal)
+            self._open_set[neighbor_cell] = neighbor
+
+    def fill_in(self, path: list[Node]) -> list[Node]:
+        """
+        Adds the cells between consecutive jump points, which are always in a
+        straight line or diagonal
+
+        :param path: jump points, goal first
+        :return: every cell on the path, goal first
+        """
+        dense_path: list[Node] = [path[0]]
+        for node in path[1:]:
+            previous: Node = dense_path[-1]
+            previous_cell: tuple[int, int] = self.grid.cell_of(previous)
+            cell: tuple[int, int] = self.grid.cell_of(node)
+            dx: int = (cell[0] > previous_cell[0]) - (cell[0] < previous_cell[0])
+            dy: int = (cell[1] > previous_cell[1]) - (cell[1] < previous_cell[1])
+            steps: int = max(
+                abs(cell[0] - previous_cell[0]), abs(cell[1] - previous_cell[1])
+            )
+
+            # walk back from previous towards node
+            for i in range(1, steps):
+                between: Node = self.grid.node_at(
+                    (previous_cell[0] + i * dx, previous_cell[1] + i * dy)
+                )
+                dense_path[-1].parent = between
+                dense_path.append(between)
+            dense_path[-1].parent = node
+            dense_path.append(node)
+
+        # costs follow the parents back from the start
+        for node in reversed(dense_path[:-1]):
+            node.start_to_node_cost = (
+                node.parent.start_to_node_cost + node.distance_to(node.parent)
+            )
+        return dense_path
+
+    def find_path(self) -> None:
+        self._goal_cell: tuple[int, int] = self.grid.cell_of(self.goal)
+        start_cell: tuple[int, int] = self.grid.cell_of(self.start)
+        # a start off its cell's center, or on a blocked or out of bounds
+        # cell, steps to its neighbors before jumping
+        self._seed_start: bool = (
+            self.start.x != start_cell[0] * self.grid.grid_spacing or
+            self.start.y != start_cell[1] * self.grid.grid_spacing or
+            not self.is_free(*start_cell)
+        )
+
+        # initialize open set with start node
+        self._open_set[start_cell] = self.start
+
+        while True:
+            # get node from open set with smallest total cost, raises a
+            # ValueError if the open set runs out
+            current_cell, self._current_node = self._open_set.pop()
+
+            # stop once we are at the goal
+            if current_cell == self._goal_cell:
+                break
+
+            # add current node to closed set
+            self._closed_set[current_cell] = self._current_node
+
+            # add jump points to open set
+            if self._current_node is self.start and self._seed_start:
+                self.add_start_neighbors_to_open_set()
+            else:
+                self.add_neighbors_to_open_set()
+
+        # update goal cost and parent with current node
+        self.goal.start_to_node_cost = (
+            self._current_node.start_to_node_cost +
+            self._current_node.distance_to(self.goal)
+        )
+        self.goal.parent = self._current_node
+
+        # get path, looping backwards through the parents
+        self._path = [self.goal]
+        while self._path[-1] != self.start:
+            self._path.append(self._path[-1].parent)
+
+        if self.dense_path:
+            self._path = self.fill_in(self._path)
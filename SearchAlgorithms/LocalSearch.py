@@ -0,0 +1,168 @@
+from __future__ import annotations
+from collections import deque
+import numpy as np
+
+class LocalSearch:
+    def __init__(
+        self,
+        distances: np.ndarray,
+        neighbor_count: int=8,
+        fixed_start: bool=True
+    ) -> None:
+        """
+        Improves open paths with 2-opt and Or-opt moves until neither finds a
+        shorter path. Moves are only tried towards each point's nearest
+        neighbors, and points whose moves all failed are skipped (don't look
+        bits) until a move changes one of their edges.
+
+        :param distances: symmetric cost matrix, like the GA's adjacency_mat
+            or TSP.distances
+        :param neighbor_count: nearest neighbors tried per point
+        :param fixed_start: keep the first point of the path first
+        """
+        self.distances = np.asarray(distances, dtype=float)
+        self.fixed_start = fixed_start
+
+        # nearest first, without the point itself
+        order: np.ndarray = np.argsort(self.distances, axis=1, kind="stable")
+        self.neighbors: list[list[int]] = [
+            [int(other) for other in row if other != point][:neighbor_count]
+            for point, row in enumerate(order)
+        ]
+
+    def cost(self, path: list[int]) -> float:
+        """
+        Distance along the path
+
+        :param path: point indices
+        :return: sum of the legs
+        """
+        path = np.asarray(path)
+        return float(self.distances[path[:-1], path[1:]].sum())
+
+    def _distance(self, a: int, b: int) -> float:
+        # a missing end of the path costs nothing to connect
+        if a is None or b is None:
+            return 0.0
+        return self.distances[a, b]
+
+    def improve(self, path: list[int]) -> list[int]:
+        """
+        Applies improving 2-opt and Or-opt moves until none are left
+
+        :param path: point indices, not modified
+        :return: improved path
+        """
+        self._path: list[int] = list(path)
+        self._positions: dict[int, int] = {
+            point: i for i, point in enumerate(self._path)
+        }
+
+        # don't look bits, only points in the queue are tried
+        queue: deque[int] = deque(self._path)
+        queued: set[int] = set(self._path)
+        while queue:
+            point: int = queue.popleft()
+            queued.discard(point)
+
+            touched: list[int] = self._two_opt(point) or self._or_opt(point)
+            for other in touched:
+                if other not in queued:
+                    queue.append(other)
+                    queued.add(other)
+
+        return self._path
+
+    def _at(self, i: int) -> int:
+        return self._path[i] if 0 <= i < len(self._path) else None
+
+    def _reorder(self, path: list[int]) -> None:
+        self._path = path
+        self._positions = {point: i for i, point in enumerate(self._path)}
+
+    def _two_opt(self, point: int) -> list[int]:
+        """
+        Reverses path[i + 1:j + 1] if that's shorter, for a new edge from point
+        to one of its neighbors
+
+        :return: points whose edges changed, empty if nothing improved
+        """
+        first_position: int = 0 if self.fixed_start else -1
+        for neighbor in self.neighbors[point]:
+            p: int = self._positions[point]
+            q: int = self._positions[neighbor]
+
+            # new edge (path[i], path[j]) or (path[i + 1], path[j + 1])
+            for i, j in (
+                (min(p, q), max(p, q)), (min(p, q) - 1, max(p, q) - 1)
+            ):
+                if i < first_position or j - i < 2:
+                    continue
+                a, b = self._at(i), self._at(i + 1)
+                c, d = self._at(j), self._at(j + 1)
+                gain: float = (
+                    self._distance(a, b) + self._distance(c, d) -
+                    self._distance(a, c) - self._distance(b, d)
+                )
+                if gain > 1e-9:
+                    self._reorder(
+                        self._path[:i + 1] +
+                        self._path[i + 1:j + 1][::-1] +
+                        self._path[j + 1:]
+                    )
+                    return [other for other in (a, b, c, d) if other is not None]
+        return []
+
+    def _or_opt(self, point: int) -> list[int]:
+        """
+        Moves a segment of 1 to 3 points starting or ending at point, possibly
+        reversed, next to a neighbor of its ends if that's shorter
+
+        :return: points whose edges changed, empty if nothing improved
+        """
+        size: int = len(self._path)
+        p: int = self._positions[point]
+        for length in (1, 2, 3):
+            for start in {p, p - length + 1}:
+                end: int = start + length - 1
+                if start < int(self.fixed_start) or end >= size or length >= size:
+                    continue
+
+                before, after = self._at(start - 1), self._at(end + 1)
+                first, last = self._path[start], self._path[end]
+                removed: float = (
+                    self._distance(before, first) +
+                    self._distance(last, after) -
+                    self._distance(before, after)
+                )
+
+                # insert between path[q] and path[q + 1], next to a neighbor
+                for neighbor in self.neighbors[first] + self.neighbors[last]:
+                    n: int = self._positions[neighbor]
+                    for q in (n - 1, n):
+                        if start - 1 <= q <= end or q < int(self.fixed_start) - 1:
+                            continue
+                        x, y = self._at(q), self._at(q + 1)
+                        for segment_first, segment_last, reverse in (
+                            (first, last, False), (last, first, True)
+                        ):
+                            added: float = (
+                                self._distance(x, segment_first) +
+                                self._distance(segment_last, y) -
+                                self._distance(x, y)
+                            )
+                            if removed - added > 1e-9:
+                                segment: list[int] = self._path[start:end + 1]
+                                if reverse:
+                                    segment.reverse()
+                                rest: list[int] = (
+                                    self._path[:start] + self._path[end + 1:]
+                                )
+                                index: int = q + 1 if q < start else q + 1 - length
+                                self._reorder(rest[:index] + segment + rest[index:])
+                                return [
+                                    other for other in
+                                    (before, after, first, last, x, y)
+                                    if other is not None
+                                ]
+        return []
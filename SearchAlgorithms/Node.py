@@ -17,6 +17,10 @@ class Node:
 
     @property
     def id(self) -> str:
+        """
+        Formatted coordinate string, kept for compatibility -- the grid and 
+        path finders key nodes on integer cells, see Grid.cell_of
+        """
         return f"({self.x:.5f}, {self.y:.5f})"
 
     @property
@@ -0,0 +1,179 @@
+from __future__ import annotations
+import math
+
+from Node import Node
+
+class NodeIndex:
+    def __init__(self, bucket_size: float) -> None:
+        """
+        Spatial hash of nodes in square buckets, for nearest and radius
+        neighbor queries on a growing tree without scanning every node.
+        Results match a brute force scan in insertion order, ties go to the
+        node inserted first.
+
+        Every time the node count doubles the index is rehashed with buckets
+        sized to hold about one node each over the area the nodes cover, so
+        sparse trees don't leave queries walking rings of empty buckets.
+
+        :param bucket_size: smallest bucket width, about the typical query 
+            distance
+        """
+        self.min_bucket_size = bucket_size
+        self.bucket_size = bucket_size
+
+        self._nodes: list[Node] = []
+        self._buckets: dict[tuple[int, int], list[tuple[int, Node]]] = {}
+        self._rehash_count: int = 64
+
+        # extent of the non empty buckets, rings past it are never searched
+        self._min_bucket: list[int] = [0, 0]
+        self._max_bucket: list[int] = [-1, -1]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def bucket_of(self, node: Node) -> tuple[int, int]:
+        return (
+            math.floor(node.x / self.bucket_size),
+            math.floor(node.y / self.bucket_size)
+        )
+
+    def insert(self, node: Node) -> None:
+        """
+        Adds a node to the index
+
+        :param node: node to add
+        """
+        self._nodes.append(node)
+        if len(self._nodes) >= self._rehash_count:
+            self._rehash()
+        else:
+            self._add_to_bucket(len(self._nodes) - 1, node)
+
+    def _add_to_bucket(self, index: int, node: Node) -> None:
+        bucket: tuple[int, int] = self.bucket_of(node)
+        if not index:
+            self._min_bucket = list(bucket)
+            self._max_bucket = list(bucket)
+        else:
+            for axis in (0, 1):
+                self._min_bucket[axis] = min(self._min_bucket[axis], bucket[axis])
+                self._max_bucket[axis] = max(self._max_bucket[axis], bucket[axis])
+
+        self._buckets.setdefault(bucket, []).append((index, node))
+
+    def _rehash(self) -> None:
+        """
+        Resizes the buckets to about one node per bucket over the nodes' 
+        bounding box and re-buckets every node
+        """
+        width: float = (
+            max(node.x for node in self._nodes) - 
+            min(node.x for node in self._nodes)
+        )
+        height: float = (
+            max(node.y for node in self._nodes) - 
+            min(node.y for node in self._nodes)
+        )
+        self.bucket_size = max(
+            self.min_bucket_size, math.sqrt(width * height / len(self._nodes))
+        )
+        self._rehash_count = 2 * len(self._nodes)
+
+        self._buckets = {}
+        for index, node in enumerate(self._nodes):
+            self._add_to_bucket(index, node)
+
+    def _ring(self, center: tuple[int, int], ring: int) -> list[tuple[int, int]]:
+        """
+        Buckets at exactly ring buckets (chebyshev) from center, clipped to the
+        extent of the non empty buckets
+        """
+        cx, cy = center
+        if not ring:
+            return [center]
+
+        min_x: int = max(cx - ring, self._min_bucket[0])
+        max_x: int = min(cx + ring, self._max_bucket[0])
+        min_y: int = max(cy - ring + 1, self._min_bucket[1])
+        max_y: int = min(cy + ring - 1, self._max_bucket[1])
+
+        buckets: list[tuple[int, int]] = []
+        for y in (cy - ring, cy + ring):
+            if self._min_bucket[1] <= y <= self._max_bucket[1]:
+                buckets += [(x, y) for x in range(min_x, max_x + 1)]
+        for x in (cx - ring, cx + ring):
+            if self._min_bucket[0] <= x <= self._max_bucket[0]:
+                buckets += [(x, y) for y in range(min_y, max_y + 1)]
+        return buckets
+
+    def nearest(self, node: Node) -> Node:
+        """
+        Finds the indexed node closest to node, searching rings of buckets
+        outwards until no closer node can exist
+
+        :param node: query node, doesn't need to be indexed
+        :return: closest node, None if the index is empty
+        """
+        if not self._nodes:
+            return None
+
+        center: tuple[int, int] = self.bucket_of(node)
+
+        # rings closer than first_ring are entirely outside the extent
+        first_ring: int = max(
+            self._min_bucket[0] - center[0],
+            center[0] - self._max_bucket[0],
+            self._min_bucket[1] - center[1],
+            center[1] - self._max_bucket[1],
+            0
+        )
+        last_ring: int = max(
+            abs(center[0] - self._min_bucket[0]),
+            abs(center[0] - self._max_bucket[0]),
+            abs(center[1] - self._min_bucket[1]),
+            abs(center[1] - self._max_bucket[1])
+        )
+
+        closest_node: Node = None
+        closest: tuple[float, int] = (float("inf"), len(self._nodes))
+        for ring in range(first_ring, last_ring + 1):
+            for bucket in self._ring(center, ring):
+                for index, other in self._buckets.get(bucket, ()):
+                    distance: tuple[float, int] = (node.distance_to(other), index)
+                    if distance < closest:
+                        closest_node = other
+                        closest = distance
+
+            # nodes in further rings are more than ring buckets away
+            if closest_node and closest[0] <= ring * self.bucket_size:
+                break
+
+        return closest_node
+
+    def within(self, node: Node, radius: float) -> list[Node]:
+        """
+        Finds the indexed nodes within radius of node
+
+        :param node: query node, doesn't need to be indexed
+        :param radius: search radius
+        :return: nodes within radius, in insertion order
+        """
+        center: tuple[int, int] = self.bucket_of(node)
+        last_ring: int = math.ceil(radius / self.bucket_size)
+
+        neighbors: list[tuple[int, Node]] = []
+        for x in range(
+            max(center[0] - last_ring, self._min_bucket[0]),
+            min(center[0] + last_ring, self._max_bucket[0]) + 1
+        ):
+            for y in range(
+                max(center[1] - last_ring, self._min_bucket[1]),
+                min(center[1] + last_ring, self._max_bucket[1]) + 1
+            ):
+                for index, other in self._buckets.get((x, y), ()):
+                    if node.distance_to(other) <= radius:
+                        neighbors.append((index, other))
+
+        neighbors.sort(key=lambda neighbor: neighbor[0])
+        return [other for _index, other in neighbors]
@@ -12,7 +12,8 @@ class Obstacle(Node):
         super().__init__(x, y)
         self.radius = radius
 
-        self._bounding_box: dict[str, Node] = {}
+        self._bounding_cells: np.ndarray = np.empty((0, 2), dtype=int)
+        self._bounding_box: dict[tuple[int, int], Node] = None
 
     def obstacles_from_file(
         filename: str, radius: float, delimter: str=","
@@ -66,27 +67,85 @@ class Obstacle(Node):
         """
         self.radius += inflation_amount
 
+    @property
+    def bounding_box(self) -> dict[tuple[int, int], Node]:
+        """
+        Nodes of the bounding box cells, created the first time they're asked 
+        for
+
+        :return: bounding box nodes keyed by cell
+        """
+        if self._bounding_box is None:
+            self._bounding_box = {
+                (ix, iy): Node(
+                    x=self.x + (ix - round(self.x / self._spacing)) * self._spacing,
+                    y=self.y + (iy - round(self.y / self._spacing)) * self._spacing,
+                    parent=self
+                )
+                for ix, iy in self._bounding_cells.tolist()
+            }
+        return self._bounding_box
+
+    def disk_offsets(radius_cells: int) -> np.ndarray:
+        """
+        Cell offsets strictly inside a disk of radius_cells cells
+
+        :param radius_cells: radius in number of cells
+        :return: (k, 2) array of cell offsets
+        """
+        offsets: np.ndarray = np.arange(-radius_cells, radius_cells + 1)
+        dx, dy = np.meshgrid(offsets, offsets, indexing="ij")
+        inside: np.ndarray = dx ** 2 + dy ** 2 < radius_cells ** 2
+        return np.column_stack((dx[inside], dy[inside]))
+
+    def rasterize(obstacles: list[Obstacle], spacing: float) -> np.ndarray:
+        """
+        Stamps every obstacle onto the grid, obstacles sharing a radius are 
+        done in one broadcast. The obstacle radii are floored to the spacing.
+
+        :param obstacles: obstacles to rasterize
+        :param spacing: grid spacing
+        :return: (n, 2) array of blocked cells, may contain duplicates
+        """
+        obstacles = list(obstacles)
+        if not obstacles:
+            return np.empty((0, 2), dtype=int)
+
+        radius_cells: np.ndarray = np.empty(len(obstacles), dtype=int)
+        for i, obstacle in enumerate(obstacles):
+            radius_cells[i] = math.floor(obstacle.radius / spacing)
+            obstacle.radius = radius_cells[i] * spacing
+
+        centers: np.ndarray = np.rint(
+            np.array([(o.x, o.y) for o in obstacles]) / spacing
+        ).astype(int)
+
+        # the obstacle's own cell is always blocked, even if its radius floors 
+        # to 0
+        cells: list[np.ndarray] = [centers]
+        for radius in np.unique(radius_cells):
+            offsets: np.ndarray = Obstacle.disk_offsets(radius)
+            group: np.ndarray = centers[radius_cells == radius]
+            cells.append(
+                (group[:, np.newaxis, :] + offsets[np.newaxis, :, :])
+                .reshape(-1, 2)
+            )
+        return np.concatenate(cells)
+
     def set_bounding_box(self, spacing: float, include_diaganols=True) -> None:
         """
-        The nodes surrounding the obstacle are its bounding box
+        The cells surrounding the obstacle are its bounding box
 
         :param spacing: spacing
         :return: None
         """
         self.radius = math.floor(self.radius / spacing) * spacing
-        for x in np.arange(
-            self.x - self.radius,
-            self.x + self.radius + spacing,
-            spacing
-        ):
-            for y in np.arange(
-                self.y - self.radius,
-                self.y + self.radius + spacing,
-                spacing
-            ):
-                node: Node = Node(x, y, parent=self)
-                if self.is_point_inside_obstacle(node):
-                    self._bounding_box[node.id] = node
+        self._spacing = spacing
+        self._bounding_cells = (
+            np.rint(np.array([self.x, self.y]) / spacing).astype(int) +
+            Obstacle.disk_offsets(round(self.radius / spacing))
+        )
+        self._bounding_box = None
 
     def is_point_inside_obstacle(self, node: Node) -> bool:
         """
@@ -0,0 +1,90 @@
+from __future__ import annotations
+import heapq
+import itertools
+
+from Node import Node
+
+class OpenSet:
+    def __init__(self) -> None:
+        """
+        Open set for the grid path finders. It reads like a dict of nodes keyed 
+        by cell, and keeps a binary heap on total cost alongside it so the 
+        cheapest node can be popped in O(log n). Replacing or deleting a node 
+        leaves its old heap entry behind, stale entries are skipped when they 
+        reach the top of the heap (lazy deletion).
+        """
+        self._nodes: dict[tuple[int, int], Node] = {}
+        self._heap: list[tuple[float, int, tuple[int, int], Node]] = []
+
+        # insertion counter, breaks cost ties first in first out
+        self._counter = itertools.count()
+
+    def __contains__(self, key: tuple[int, int]) -> bool:
+        return key in self._nodes
+
+    def __getitem__(self, key: tuple[int, int]) -> Node:
+        return self._nodes[key]
+
+    def __setitem__(self, key: tuple[int, int], node: Node) -> None:
+        """
+        Adds a node, or replaces the node already at key. The node's total cost 
+        must not change while it is in the open set.
+        """
+        self._nodes[key] = node
+        heapq.heappush(
+            self._heap, (node.total_cost, next(self._counter), key, node)
+        )
+
+    def __delitem__(self, key: tuple[int, int]) -> None:
+        del self._nodes[key]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __iter__(self):
+        return iter(self._nodes)
+
+    def get(self, key: tuple[int, int], default: Node=None) -> Node:
+        return self._nodes.get(key, default)
+
+    def keys(self):
+        return self._nodes.keys()
+
+    def values(self):
+        return self._nodes.values()
+
+    def items(self):
+        return self._nodes.items()
+
+    def _drop_stale(self) -> None:
+        """
+        Pops heap entries that were replaced or deleted off the top of the heap
+        """
+        while self._heap and self._nodes.get(self._heap[0][2]) is not self._heap[0][3]:
+            heapq.heappop(self._heap)
+
+    def peek(self) -> Node:
+        """
+        Gets the node with the smallest total cost without removing it
+
+        :return: cheapest node
+        """
+        self._drop_stale()
+        if not self._heap:
+            raise ValueError("peek at an empty open set")
+        return self._heap[0][3]
+
+    def pop(self) -> tuple[tuple[int, int], Node]:
+        """
+        Removes the node with the smallest total cost
+
+        :return: (key, node) of the cheapest node
+        """
+        self._drop_stale()
+        if not self._heap:
+            # ValueError to match min() on an empty sequence, which is what
+            # callers have always caught as 'no path'
+            raise ValueError("pop from an empty open set")
+        _cost, _count, key, node = heapq.heappop(self._heap)
+        del self._nodes[key]
+        return key, node
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from Grid import Grid
 from Node import Node
+from OpenSet import OpenSet
 from Stopwatch import Stopwatch
 
 class PathFinder:
@@ -17,6 +18,10 @@ class PathFinder:
         self.grid = grid
         self.do_diagonals = do_diagonals
 
+        # bumped by every reset, per cell search state stamped with an older 
+        # generation is treated as unvisited
+        self._generation: int = 0
+
         self.reset()
 
     @property
@@ -24,19 +29,27 @@ class PathFinder:
         return self._path
 
     @property
-    def open_set(self) -> dict[str, Node]:
+    def open_set(self) -> OpenSet:
         return self._open_set
 
     @property
-    def closed_set(self) -> dict[str, Node]:
+    def closed_set(self) -> dict[tuple[int, int], Node]:
         return self._closed_set
 
     def reset(self) -> None:
+        """
+        Invalidates the previous search in O(1), nothing is done per grid cell
+        """
+        self._generation += 1
         self._current_node: Node = None
-        self._open_set: dict[str, Node] = {}
-        self._closed_set: dict[str, Node] = {}
+        self._open_set: OpenSet = OpenSet()
+        self._closed_set: dict[tuple[int, int], Node] = {}
         self._path: list[Node] = []
-        for node in self.grid.nodes.values():
-            node.reset()
+
+        # searches build their own nodes, the start and goal are the only 
+        # shared nodes they write to
+        for node in (self.start, self.goal):
+            if node:
+                node.reset()
 
         self.stopwatch: Stopwatch = Stopwatch()
\ No newline at end of file
@@ -4,6 +4,7 @@ import random
 
 from Colors import Colors
 from Node import Node
+from NodeIndex import NodeIndex
 from PathFinder import PathFinder
 
 class RRT(PathFinder):
@@ -11,29 +12,111 @@ class RRT(PathFinder):
         self, 
         step_length: float, 
         sub_step_length: float=None,
+        exact_steps: bool=False,
+        goal_bias: float=0.0,
+        sampling: str="area",
+        sample_batch_size: int=1024,
+        seed: int=None,
+        max_iterations: int=None,
         *args, **kwargs
     ) -> None:
-        super().__init__(*args, **kwargs)
+        """
+        :param step_length: distance to step towards each random node
+        :param sub_step_length: spacing of the points checked along a step 
+            when exact_steps is False
+        :param exact_steps: check every grid cell a step passes through 
+            instead of points sub_step_length apart
+        :param goal_bias: chance a random node is the goal instead
+        :param sampling: "area" samples uniformly over the grid expanded by a 
+            quarter on each side, "free" samples only within valid cells
+        :param sample_batch_size: random nodes drawn per NumPy call
+        :param seed: seed of the random nodes, None draws it from the random 
+            module so random.seed still makes runs repeatable
+        :param max_iterations: random nodes to draw before giving up, None to
+            search until the goal is in reach
+        """
+        if sampling not in ("area", "free"):
+            raise ValueError(f"Unknown RRT sampling: {sampling}")
+
         self.step_length = step_length
+        self.exact_steps = exact_steps
         self.sub_step_length = (
             step_length / 5 
             if not sub_step_length 
             else sub_step_length
         )
+        self.goal_bias = goal_bias
+        self.sampling = sampling
+        self.sample_batch_size = sample_batch_size
+        self.max_iterations = max_iterations
+        self._rng: np.random.Generator = np.random.default_rng(
+            seed if seed is not None else random.getrandbits(64)
+        )
+        super().__init__(*args, **kwargs)
 
-    def generate_random_node(self) -> Node:
-        x_range_expansion: float = (self.grid.max_x - self.grid.min_x) / 4
-        y_range_expansion: float = (self.grid.max_y - self.grid.min_y) / 4
-        self._random_node = Node(
-            x=random.uniform(
-                self.grid.min_x - x_range_expansion,
-                self.grid.max_x + x_range_expansion
-            ),
-            y=random.uniform(
-                self.grid.min_y - y_range_expansion,
-                self.grid.max_y + y_range_expansion
+    def reset(self) -> None:
+        super().reset()
+
+        # the tree is never popped by cost, so a plain dict will do
+        self._open_set: dict[int, Node] = {}
+
+        # spatial index of the tree for nearest neighbor queries
+        self._node_index: NodeIndex = NodeIndex(self.step_length)
+
+        # random nodes are drawn in batches and handed out one at a time
+        self._samples: list[tuple[float, float]] = []
+
+        self.iterations: int = 0
+
+    def draw_samples(self) -> None:
+        """
+        Draws the next batch of random node coordinates in one go
+        """
+        if self.sampling == "area":
+            x_range_expansion: float = (self.grid.max_x - self.grid.min_x) / 4
+            y_range_expansion: float = (self.grid.max_y - self.grid.min_y) / 4
+            samples: np.ndarray = self._rng.uniform(
+                (
+                    self.grid.min_x - x_range_expansion, 
+                    self.grid.min_y - y_range_expansion
+                ),
+                (
+                    self.grid.max_x + x_range_expansion, 
+                    self.grid.max_y + y_range_expansion
+                ),
+                size=(self.sample_batch_size, 2)
             )
-        )
+
+        else:
+            # valid cell centers, only recomputed when the grid changes
+            if getattr(self, "_valid_points_version", None) != self.grid._version:
+                self._valid_points_version: int = self.grid._version
+                self._valid_points: np.ndarray = np.column_stack(
+                    self.grid.valid_points()
+                )
+            # anywhere within the picked cells, not only their centers
+            samples: np.ndarray = self._valid_points[self._rng.integers(
+                len(self._valid_points), size=self.sample_batch_size
+            )] + self._rng.uniform(
+                -self.grid.grid_spacing / 2, 
+                self.grid.grid_spacing / 2, 
+                size=(self.sample_batch_size, 2)
+            )
+
+        if self.goal_bias:
+            samples[
+                self._rng.random(self.sample_batch_size) < self.goal_bias
+            ] = (self.goal.x, self.goal.y)
+
+        # reversed so pop hands them out in the order they were drawn
+        self._samples = samples[::-1].tolist()
+
+    def generate_random_node(self) -> Node:
+        if not self._samples:
+            self.draw_samples()
+
+        x, y = self._samples.pop()
+        self._random_node = Node(x=x, y=y)
         return self._random_node
 
     def step_towards_node(self, root: Node, node: Node, step_length: float) -> Node:
@@ -49,17 +132,25 @@ class RRT(PathFinder):
         self, start: Node, stop: Node, sub_step_length: float
     ) -> bool:
         """
-        Check if points of sub-step length between start and stop are valid.
+        Check if the step between start and stop is valid, either exactly 
+        cell by cell or at points of sub-step length. Either way the check 
+        returns at the first collision.
         """
-        for step in np.linspace(0, 1, int(start.distance_to(stop) / sub_step_length)):
-            node: Node = Node(
-                x=start.x + step * (stop.x - start.x),
-                y=start.y + step * (stop.y - start.y)
-            )
-            snapped_node: Node = self.grid.snap_node_to_grid(node)
-            if not self.grid.node_is_valid(snapped_node):
-                return False
-        return True
+        if self.exact_steps:
+            return self.grid.segment_is_valid(start, stop)
+
+        # the new node is the likeliest point to collide, so it's checked 
+        # before the rest of the points in one batch
+        if not self.grid.node_is_valid(stop):
+            return False
+
+        steps: np.ndarray = np.linspace(
+            0, 1, int(start.distance_to(stop) / sub_step_length)
+        )
+        return bool(np.all(self.grid.points_are_valid(
+            start.x + steps * (stop.x - start.x),
+            start.y + steps * (stop.y - start.y)
+        )))
 
     def find_path(self) -> None:
         """
@@ -70,19 +161,26 @@ class RRT(PathFinder):
             - If step and sub-steps are valid
                 * add to open set
         """
-        self._open_set[self.start.id] = self.start
+        # tree nodes aren't on the grid, so they are keyed by insertion order
+        self._open_set[len(self._open_set)] = self.start
+        self._node_index.insert(self.start)
         self._current_node = self.start
 
         # while current node is not in reach of goal
         while self._current_node.distance_to(self.goal) > self.step_length:
             while True:
+                if self.max_iterations and self.iterations >= self.max_iterations:
+                    raise ValueError("No path found within the budget")
+                self.iterations += 1
+
                 # generate random node
                 random_node: Node = self.generate_random_node()
 
                 # find closest discovered node
-                closest_node: Node = random_node.find_closest_node(
-                    self._open_set.values()
-                )
+                closest_node: Node = self._node_index.nearest(random_node)
+                if closest_node.distance_to(random_node) == 0:
+                    # a sample on top of a tree node has no direction to step in
+                    continue
 
                 # step towards random node from closest node
                 self._current_node = self.step_towards_node(
@@ -99,7 +197,8 @@ class RRT(PathFinder):
                 if self.is_valid_step(
                     closest_node, self._current_node, self.sub_step_length
                 ):
-                    self._open_set[self._current_node.id] = self._current_node
+                    self._open_set[len(self._open_set)] = self._current_node
+                    self._node_index.insert(self._current_node)
                     # ax.plot(
                     #     random_node.x, 
                     #     random_node.y,
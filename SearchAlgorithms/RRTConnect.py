@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from Node import Node
+from NodeIndex import NodeIndex
+from RRT import RRT
+
+class RRTConnect(RRT):
+    def __init__(
+        self,
+        step_length: float,
+        max_iterations: int=None,
+        *args, **kwargs
+    ) -> None:
+        """
+        Bidirectional RRT, one tree grows from the start and one from the goal.
+        Each iteration extends one tree a step towards a random node, then the
+        other tree steps greedily towards the new node until it reaches it or
+        is blocked. The trees swap roles every iteration.
+
+        :param step_length: distance to step towards each random node
+        :param max_iterations: random nodes to draw before giving up, None to
+            search until the trees connect like RRT
+        """
+        super().__init__(
+            step_length, *args, max_iterations=max_iterations, **kwargs
+        )
+
+    def reset(self) -> None:
+        super().reset()
+
+        # the start tree uses RRT's _node_index, goal tree costs are measured
+        # from the goal until the trees are joined
+        self._goal_node_index: NodeIndex = NodeIndex(self.step_length)
+
+    def add_node(self, node_index: NodeIndex, node: Node) -> None:
+        # both trees are kept in the open set for plotting
+        self._open_set[len(self._open_set)] = node
+        node_index.insert(node)
+
+    def connect_tree(self, node_index: NodeIndex, target: Node) -> Node:
+        """
+        Steps the tree greedily towards target until it's within a step of it
+
+        :param node_index: index of the tree to grow
+        :param target: node to grow towards, from the other tree
+        :return: tree node with a valid step to target, None if blocked
+        """
+        closest_node: Node = node_index.nearest(target)
+        while closest_node.distance_to(target) > self.step_length:
+            self._current_node = self.step_towards_node(
+                closest_node, target, self.step_length
+            )
+            if not self.is_valid_step(
+                closest_node, self._current_node, self.sub_step_length
+            ):
+                return None
+
+            self.add_node(node_index, self._current_node)
+            closest_node = self._current_node
+
+        if not self.is_valid_step(closest_node, target, self.sub_step_length):
+            return None
+        return closest_node
+
+    def join_trees(self, start_tree_node: Node, goal_tree_node: Node) -> None:
+        """
+        Reverses the goal tree's branch from goal_tree_node so every node on it
+        points back to start_tree_node, updating the costs along the way
+        """
+        branch: list[Node] = [goal_tree_node]
+        while branch[-1].parent:
+            branch.append(branch[-1].parent)
+
+        parent: Node = start_tree_node
+        for node in branch:
+            node.parent = parent
+            node.start_to_node_cost = (
+                parent.start_to_node_cost + parent.distance_to(node)
+            )
+            parent = node
+
+    def find_path(self) -> None:
+        """
+        Until the trees connect
+            - Generate random node
+            - Step towards it from the closest node in this tree
+            - If the step is valid, grow the other tree towards the new node
+            - Swap the trees
+        Then the goal tree's branch is hung off the start tree.
+        """
+        self.add_node(self._node_index, self.start)
+        self.add_node(self._goal_node_index, self.goal)
+        node_index, other_node_index = self._node_index, self._goal_node_index
+
+        while True:
+            if self.max_iterations and self.iterations >= self.max_iterations:
+                raise ValueError("No path found within the budget")
+            self.iterations += 1
+
+            # generate random node and step towards it from the closest node
+            random_node: Node = self.generate_random_node()
+            closest_node: Node = node_index.nearest(random_node)
+            if closest_node.distance_to(random_node) == 0:
+                # a sample on top of a tree node has no direction to step in
+                continue
+            new_node: Node = self.step_towards_node(
+                closest_node, random_node, self.step_length
+            )
+
+            if self.is_valid_step(closest_node, new_node, self.sub_step_length):
+                self.add_node(node_index, new_node)
+                self._current_node = new_node
+
+                # grow the other tree towards the new node
+                other_node: Node = self.connect_tree(other_node_index, new_node)
+                if other_node:
+                    if node_index is self._node_index:
+                        self.join_trees(new_node, other_node)
+                    else:
+                        self.join_trees(other_node, new_node)
+                    break
+
+            node_index, other_node_index = other_node_index, node_index
+
+        # construct path
+        self._path = [self.goal]
+        while self._path[-1].parent:
+            self._path.append(self._path[-1].parent)
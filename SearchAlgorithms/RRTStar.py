@@ -0,0 +1,186 @@
+from __future__ import annotations
+import math
+
+from Node import Node
+from RRT import RRT
+from Stopwatch import Stopwatch
+
+class RRTStar(RRT):
+    def __init__(
+        self,
+        step_length: float,
+        max_iterations: int=20000,
+        time_budget: float=None,
+        gamma: float=None,
+        max_radius: float=None,
+        *args, **kwargs
+    ) -> None:
+        """
+        RRT that keeps sampling after the first path is found, connecting each
+        new node to its cheapest valid neighbor and rewiring neighbors through
+        it when that makes them cheaper.
+
+        :param step_length: distance to step towards each random node
+        :param max_iterations: samples to draw before stopping
+        :param time_budget: seconds to search before stopping, if given
+        :param gamma: neighbor radius constant, the radius is
+            min(gamma * sqrt(log(n) / n), max_radius) for n tree nodes,
+            defaults to the RRT* bound for the grid's area
+        :param max_radius: largest neighbor radius, defaults to 3 steps
+        """
+        self.time_budget = time_budget
+        self.gamma = gamma
+        self.max_radius = max_radius if max_radius else 3 * step_length
+        super().__init__(
+            step_length, *args, max_iterations=max_iterations, **kwargs
+        )
+
+        if not self.gamma:
+            area: float = (
+                (self.grid.max_x - self.grid.min_x) *
+                (self.grid.max_y - self.grid.min_y)
+            )
+            self.gamma = 2 * math.sqrt(1.5) * math.sqrt(area / math.pi)
+
+    def reset(self) -> None:
+        super().reset()
+
+        # children of each tree node keyed by id(node), so rewiring can push a
+        # cost change down the subtree
+        self._children: dict[int, list[Node]] = {}
+
+        # tree nodes that can step straight to the goal
+        self._goal_parents: list[Node] = []
+
+    def neighbor_radius(self) -> float:
+        """
+        Shrinking radius for the parent and rewire neighbors
+        """
+        count: int = len(self._node_index) + 1
+        return min(
+            self.gamma * math.sqrt(math.log(count) / count), self.max_radius
+        )
+
+    def budget_spent(self, stopwatch: Stopwatch) -> bool:
+        return (
+            self.iterations >= self.max_iterations or
+            (self.time_budget is not None and stopwatch.running_time >= self.time_budget)
+        )
+
+    def add_node(self, node: Node) -> None:
+        self._open_set[len(self._open_set)] = node
+        self._node_index.insert(node)
+        self._children[id(node)] = []
+        if node.parent:
+            self._children[id(node.parent)].append(node)
+
+    def rewire(self, node: Node, parent: Node, cost: float) -> None:
+        """
+        Moves node under parent with a cheaper cost, updating the costs of
+        every node below it
+        """
+        self._children[id(node.parent)].remove(node)
+        self._children[id(parent)].append(node)
+        node.parent = parent
+
+        cost_change: float = cost - node.start_to_node_cost
+        subtree: list[Node] = [node]
+        while subtree:
+            child: Node = subtree.pop()
+            child.start_to_node_cost += cost_change
+            subtree += self._children[id(child)]
+
+    def find_path(self) -> None:
+        """
+        Until the budget is spent
+            - Generate random node
+            - Step towards it from the closest tree node
+            - Connect the new node through its cheapest valid neighbor
+            - Rewire neighbors through the new node when it's cheaper
+        Then the goal is connected through its cheapest tree node.
+        """
+        stopwatch: Stopwatch = Stopwatch()
+        stopwatch.start()
+
+        self.add_node(self.start)
+        while not self.budget_spent(stopwatch):
+            self.iterations += 1
+
+            # generate random node and step towards it from the closest node
+            random_node: Node = self.generate_random_node()
+            closest_node: Node = self._node_index.nearest(random_node)
+            if closest_node.distance_to(random_node) == 0:
+                # a sample on top of a tree node has no direction to step in
+                continue
+            self._current_node = self.step_towards_node(
+                closest_node, random_node, self.step_length
+            )
+            if not self.is_valid_step(
+                closest_node, self._current_node, self.sub_step_length
+            ):
+                continue
+
+            # cheapest valid parent, candidates are checked cheapest first so
+            # most of them never need a collision check
+            neighbors: list[Node] = self._node_index.within(
+                self._current_node, self.neighbor_radius()
+            )
+            candidates: list[tuple[float, Node]] = sorted(
+                (
+                    (
+                        neighbor.start_to_node_cost +
+                        neighbor.distance_to(self._current_node),
+                        neighbor
+                    )
+                    for neighbor in neighbors
+                    if neighbor is not closest_node
+                ),
+                key=lambda candidate: candidate[0]
+            )
+            for cost, neighbor in candidates:
+                if cost >= self._current_node.start_to_node_cost:
+                    break
+                if self.is_valid_step(
+                    neighbor, self._current_node, self.sub_step_length
+                ):
+                    self._current_node.parent = neighbor
+                    self._current_node.start_to_node_cost = cost
+                    break
+            self.add_node(self._current_node)
+
+            # rewire neighbors that are cheaper through the new node
+            for neighbor in neighbors:
+                cost: float = (
+                    self._current_node.start_to_node_cost +
+                    self._current_node.distance_to(neighbor)
+                )
+                if cost < neighbor.start_to_node_cost and self.is_valid_step(
+                    self._current_node, neighbor, self.sub_step_length
+                ):
+                    self.rewire(neighbor, self._current_node, cost)
+
+            if (
+                self._current_node.distance_to(self.goal) <= self.step_length and
+                self.is_valid_step(
+                    self._current_node, self.goal, self.sub_step_length
+                )
+            ):
+                self._goal_parents.append(self._current_node)
+
+        if not self._goal_parents:
+            raise ValueError("No path found within the budget")
+
+        # update goal's cost and parent with its cheapest tree node
+        self.goal.parent = min(
+            self._goal_parents,
+            key=lambda node: node.start_to_node_cost + node.distance_to(self.goal)
+        )
+        self.goal.start_to_node_cost = (
+            self.goal.parent.start_to_node_cost +
+            self.goal.parent.distance_to(self.goal)
+        )
+
+        # construct path
+        self._path = [self.goal]
+        while self._path[-1].parent:
+            self._path.append(self._path[-1].parent)
@@ -7,15 +7,14 @@ import os
 import random
 
 # path finders imports
-from AStar import AStar
-from Dijkstra import Dijkstra
-from RRT import RRT
+from BatchPlanner import PATH_FINDERS
 
 # support imports
 from Colors import Colors
 from Grid import Grid
 from Node import Node
 from Obstacle import Obstacle
+from PathFinder import PathFinder
 
 class Scenario:
     def loader(self, filename: str) -> Scenario:
@@ -47,21 +46,70 @@ class Scenario:
         goal: float | "random"
         algorithm: {
 
-            type: "AStar" | "Dijkstra" | "RRT"
+            type: "ARAStar" | "AStar" | "ArrayAStar" | "BidirectionalAStar" | 
+                "DStarLite" | "Dijkstra" | "JumpPointSearch" | "RRT" | 
+                "RRTConnect" | "RRTStar" | "ThetaStar"
 
             params: {
 
+                --ARAStar
+                Optional[epsilon]: float (default=3.0, heuristic inflation of
+                    the first search)
+                Optional[epsilon_step]: float (default=0.5)
+                Optional[time_budget]: float (default=None, seconds, searches
+                    until epsilon reaches 1)
+
+                --Dijkstra
+                Optional[mode]: "goal" | "tree" (default="goal")
+
+                --JumpPointSearch
+                Optional[dense_path]: bool (default=false, true fills in every
+                    cell between the jump points)
+
                 --RRT
                 step_length: float
                 Optional[sub_step_length]: float (default=step_length / 5)
+                Optional[exact_steps]: bool (default=false, true checks every 
+                    cell a step crosses instead of points sub_step_length apart)
+                Optional[goal_bias]: float (default=0.0, chance to sample the goal)
+                Optional[sampling]: "area" | "free" (default="area", "free" only
+                    samples within valid cells)
+                Optional[sample_batch_size]: int (default=1024)
+                Optional[seed]: int (default=None, drawn from the scenario seed)
+                Optional[max_iterations]: int (default=None, search until
+                    the goal is in reach)
+
+                --RRTConnect
+                RRT params
+                Optional[max_iterations]: int (default=None, search until
+                    the trees connect)
+
+                --RRTStar
+                RRT params
+                Optional[max_iterations]: int (default=20000)
+                Optional[time_budget]: float (default=None, seconds)
+                Optional[gamma]: float (default=RRT* bound for the grid area)
+                Optional[max_radius]: float (default=3 * step_length)
+
+                --ThetaStar
+                Optional[lazy]: bool (default=false, true only checks line of
+                    sight when a node is expanded, Lazy Theta*)
             }
         }
+
+        ### Optional Keys
+
+        seed: int (seeds the random obstacles, start, goal and RRT samples)
         """
 
         cwd: str = os.path.dirname(os.path.realpath(__file__))
         with open(os.path.join(cwd, filename), "r") as f:
             data = json.load(f)
 
+        key = "seed"
+        if key in data:
+            random.seed(data[key])
+
         # go down the mandatory keys and set the values
         # throws an uncaught error if we are missing any keys in the scenario...
 
@@ -112,7 +160,7 @@ class Scenario:
         self.has_random_start = False
         if data[key] == "random":
             self.has_random_start = True
-            self.start = random.choice(list(self.grid._valid_nodes.values()))
+            self.start = self.grid.random_valid_node()
 
         else:
             self.start: Node = Node(
@@ -124,7 +172,7 @@ class Scenario:
         self.has_random_goal = False
         if data[key] == "random":
             self.has_random_goal = True
-            self.goal = random.choice(list(self.grid._valid_nodes.values()))
+            self.goal = self.grid.random_valid_node()
 
         else:
             self.goal: Node = Node(
@@ -133,7 +181,9 @@ class Scenario:
             )
 
         key = "algorithm"
-        self.algorithm: AStar | Dijkstra | RRT  = eval(data[key]["type"])(
+        if data[key]["type"] not in PATH_FINDERS:
+            raise ValueError(f"Unknown algorithm: {data[key]['type']}")
+        self.algorithm: PathFinder = PATH_FINDERS[data[key]["type"]](
             start=self.start,
             goal=self.goal,
             grid=self.grid,
@@ -166,7 +216,7 @@ class Scenario:
         :param ax: axis to plot on
         """
         if invalid_nodes:
-            for node in self.grid._invalid_nodes.values():
+            for node in self.grid.invalid_nodes.values():
                 ax.plot(
                     node.x, node.y, 
                     color=(
@@ -178,7 +228,7 @@ class Scenario:
                 )
 
         if valid_nodes:
-            for node in self.grid._valid_nodes.values():
+            for node in self.grid.valid_nodes.values():
                 ax.plot(node.x, node.y, color=Colors.light_grey, marker=".")
 
     def plot_path(self, ax: plt.Axes, color: str) -> None:
@@ -196,7 +246,7 @@ class Scenario:
         """
         Plots the open set on the given axes
         """
-        for node in self.algorithm._open_set.values():
+        for node in self.algorithm.open_set.values():
             ax.text(
                 node.x, node.y, f"{node.total_cost:.1f}", 
                 color=color, ha="center", va="center",
@@ -207,7 +257,7 @@ class Scenario:
         """
         Plots the closed set on the given axes
         """
-        for node in self.algorithm._closed_set.values():
+        for node in self.algorithm.closed_set.values():
             ax.text(
                 node.x, node.y, f"{node.total_cost:.1f}", 
                 color=color, ha="center", va="center",
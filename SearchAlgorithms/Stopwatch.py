@@ -12,6 +12,13 @@ class Stopwatch:
         """
         return self.end - self.start_time
 
+    @property
+    def running_time(self) -> float:
+        """
+        Returns the seconds since the stopwatch was started, without stopping it
+        """
+        return time.perf_counter() - self.start_time
+
     def start(self) -> None:
         """
         Starts the stopwatch
@@ -0,0 +1,227 @@
+from __future__ import annotations
+import numpy as np
+
+from Grid import Grid
+from Node import Node
+from PathFinder import PathFinder
+
+class ThetaStar(PathFinder):
+    def __init__(
+        self, start: Node, goal: Node, grid: Grid, lazy: bool=False
+    ) -> None:
+        """
+        Any-angle A*. Same moves as AStar, but a neighbor takes the current
+        node's parent as its own parent when the straight segment between
+        them is valid, so paths run straight between obstacle corners instead
+        of in 45 degree steps and have far fewer waypoints.
+
+        :param lazy: Lazy Theta*, assume the segment is valid when a neighbor
+            is added and only check it when the neighbor is expanded, falling
+            back to its cheapest expanded neighbor as parent. Far fewer
+            segment checks for slightly longer paths.
+        """
+        self.lazy = lazy
+        super().__init__(start, goal, grid)
+
+    def reset(self) -> None:
+        super().reset()
+
+        # segments checked, the expensive part of the search
+        self.line_of_sight_checks: int = 0
+
+        # the free cells are only (re)built when the grid changes
+        if getattr(self, "_grid_version", None) != self.grid._version:
+            self._grid_version: int = self.grid._version
+
+            # padded with a blocked border so a segment never needs a bounds
+            # check, lists because single lookups are faster than NumPy
+            self._free: list[list[bool]] = np.pad(
+                ~self.grid._occupancy, 1, constant_values=False
+            ).tolist()
+            self._x_offset: int = self.grid._cell_offset[0] - 1
+            self._y_offset: int = self.grid._cell_offset[1] - 1
+
+    def line_of_sight(self, start: Node, stop: Node) -> bool:
+        """
+        Checks every cell the segment between the nodes crosses, walking the
+        same cells as Grid.segment_is_valid. Between cell centers the walk is
+        done in integers, a start or goal off its cell's center falls back to
+        Grid.segment_is_valid.
+
+        :return: True if the segment is valid
+        """
+        self.line_of_sight_checks += 1
+
+        spacing: float = self.grid.grid_spacing
+        x, y = self.grid.cell_of(start)
+        end_x, end_y = self.grid.cell_of(stop)
+        if (
+            start.x != x * spacing or start.y != y * spacing or
+            stop.x != end_x * spacing or stop.y != end_y * spacing
+        ):
+            return self.grid.segment_is_valid(start, stop)
+
+        free: list[list[bool]] = self._free
+        x_offset: int = self._x_offset
+        y_offset: int = self._y_offset
+        if not free[x - x_offset][y - y_offset]:
+            return False
+
+        # from the center of a cell, the i-th x boundary is crossed at
+        # t = (2i + 1) / (2dx) and the j-th y boundary at (2j + 1) / (2dy),
+        # comparing the two cross multiplied tells which comes first
+        dx: int = abs(end_x - x)
+        dy: int = abs(end_y - y)
+        step_x: int = 1 if end_x > x else -1
+        step_y: int = 1 if end_y > y else -1
+        i: int = 0
+        j: int = 0
+        while i < dx or j < dy:
+            crossing: int = (2 * i + 1) * dy - (2 * j + 1) * dx
+            if crossing < 0:
+                x += step_x
+                i += 1
+
+            elif crossing > 0:
+                y += step_y
+                j += 1
+
+            # through a corner, straight to the diagonal cell
+            else:
+                x += step_x
+                y += step_y
+                i += 1
+                j += 1
+
+            if not free[x - x_offset][y - y_offset]:
+                return False
+
+        return True
+
+    def moves(self) -> list[tuple[int, int]]:
+        # instead of nested loops, we define a list of valid moves in cells
+        diagonal_moves = [
+            (-1, -1),  # left bottom
+            (-1, 1),   # left top
+            (1, -1),   # right bottom
+            (1, 1),    # right top
+        ]
+
+        move_list = [
+            (-1, 0),   # left center
+            (0, -1),   # center bottom
+            (0, 1),    # center top
+            (1, 0),    # right center
+        ]
+
+        if self.do_diagonals:
+            move_list += diagonal_moves
+
+        return move_list
+
+    def set_parent(self) -> None:
+        """
+        Lazy Theta*, if the current node can't see the parent it was given,
+        reparents it to its cheapest expanded neighbor instead
+        """
+        parent: Node = self._current_node.parent
+        if not parent or self.line_of_sight(parent, self._current_node):
+            return
+
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
+        for move in self.moves():
+            neighbor: Node = self._closed_set.get(
+                (current_cell[0] + move[0], current_cell[1] + move[1])
+            )
+            if not neighbor:
+                continue
+
+            cost: float = (
+                neighbor.start_to_node_cost +
+                neighbor.distance_to(self._current_node)
+            )
+            if (
+                self._current_node.parent is parent or
+                cost < self._current_node.start_to_node_cost
+            ):
+                self._current_node.parent = neighbor
+                self._current_node.start_to_node_cost = cost
+
+    def add_neighbors_to_open_set(self) -> None:
+        """
+        Adds neighbors of the current node to open set, parented to the
+        current node's parent when it can see them
+        """
+        current_cell: tuple[int, int] = self.grid.cell_of(self._current_node)
+        grandparent: Node = self._current_node.parent
+        for move in self.moves():
+            neighbor_cell: tuple[int, int] = (
+                current_cell[0] + move[0], current_cell[1] + move[1]
+            )
+            if (
+                neighbor_cell in self._closed_set or
+                not self.grid.cell_is_valid(neighbor_cell)
+            ):
+                continue
+
+            neighbor: Node = self.grid.node_at(neighbor_cell)
+            if grandparent and (
+                self.lazy or self.line_of_sight(grandparent, neighbor)
+            ):
+                neighbor.parent = grandparent
+            else:
+                neighbor.parent = self._current_node
+
+            neighbor.start_to_node_cost = (
+                neighbor.parent.start_to_node_cost +
+                neighbor.distance_to(neighbor.parent)
+            )
+            neighbor.heuristic_cost = neighbor.distance_to(self.goal)
+
+            # if we've already noted this neighbor
+            if neighbor_cell in self._open_set:
+                # if its cost got cheaper
+                if neighbor.total_cost < self._open_set[neighbor_cell].total_cost:
+                    self._open_set[neighbor_cell] = neighbor
+
+            # brand new neighbor
+            else:
+                self._open_set[neighbor_cell] = neighbor
+
+    def find_path(self) -> None:
+        goal_cell: tuple[int, int] = self.grid.cell_of(self.goal)
+
+        # initialize open set with start node
+        self._open_set[self.grid.cell_of(self.start)] = self.start
+
+        while True:
+            # get node from open set with smallest total cost, raises a
+            # ValueError if the open set runs out
+            current_cell, self._current_node = self._open_set.pop()
+            if self.lazy:
+                self.set_parent()
+
+            # stop once we are at the goal
+            if current_cell == goal_cell:
+                break
+
+            # add current node to closed set
+            self._closed_set[current_cell] = self._current_node
+
+            # add neighbors to open set
+            self.add_neighbors_to_open_set()
+
+        # update goal cost and parent with current node, or its parent if the
+        # goal can see it
+        parent: Node = self._current_node
+        if parent.parent and self.line_of_sight(parent.parent, self.goal):
+            parent = parent.parent
+        self.goal.start_to_node_cost = (
+            parent.start_to_node_cost + parent.distance_to(self.goal)
+        )
+        self.goal.parent = parent
+
+        # get path, looping backwards through the parents
+        self._path = [self.goal]
+        while self._path[-1] != self.start:
+            self._path.append(self._path[-1].parent)
@@ -11,147 +11,22 @@ import numpy as np
 import matplotlib.pyplot as plt
 import time
 import pylab as pl # Needed for plotting numbers on plots
+
+from CostMatrix import CostMatrix
+from LocalSearch import LocalSearch
+from Node import Node
+from Scenario import Scenario
 #%matplotlib inline
 #%config InlineBackend.figure_format = 'svg'
 plt.style.use("seaborn")
 np.random.seed(42)
 
-class path_store:
-    def __init__(self, x, y, cost):
-        self.x = x
-        self.y = y
-        self.cost = cost
-
 # Traveling Salesman Problem Example #
 #       5 Desired Waypoints
 
-# my_code...
-from Scenario import Scenario
-scenario: Scenario = Scenario().loader(
-    #####  the naming structure for scenarios  #####
-    # "scenarios / SearchType _ grid-size _ bot-size _ grid-spacing.json"
-    # "scenarios/AStar_10x10_bot-0o5_grid-0o5.json"  --> -->
-    # "scenarios / AStar _ 10x10 grid _ bot radius 0.5 _ grid spacing 0.5"
-    # if 'random' is at the end, then random start/goal pos and/or obstacle pos
-    #####
-
-    #####  scenarios in the "scenarios" folder  #####
-    # "scenarios/AStar_10x10_bot-0o5_grid-0o5.json"
-    # "scenarios/AStar_10x10_bot-0o5_grid-0o5_random.json"
-    # "scenarios/AStar_15x15_bot-0o5_grid-0o5a.json"       # Exam2 Problem 3
-    "scenarios/AStar_15x15_bot-0o5_grid-0o5b.json"       # Exam2 Problem 4
-    # "scenarios/AStar_15x15_bot-0o5_grid-1o0.json"        # HW5 problem 1a
-    # "scenarios/AStar_50x50_bot-0o5_grid-0o5.json"        # HW3 problem 2
-    # "scenarios/AStar_50x50_bot-0o5_grid-0o5_random.json"
-    # "scenarios/Dijkstra_15x15_bot-0o5_grid-1o0.json"     # HW5 problem 1b
-    # "scenarios/RRT_10x10_bot-0o5_grid-0o5.json"
-    # "scenarios/RRT_10x10_bot-0o5_grid-0o5_random.json"
-    # "scenarios/RRT_15x15_bot-0o5_grid-1o0.json"          # HW5 problem 1c
-    # "scenarios/RRT_50x50_bot-0o5_grid-0o5.json"          # HW3 problem 3
-    #####
-)
-
-from Node import Node
-nodes = [
-    Node(1,1),
-    Node(9,7),
-    Node(1,9),
-    Node(4,4),
-    Node(9,4),
-    Node(6,14),
-    Node(3,11),
-    Node(14,1),
-    Node(1,14),
-    Node(14,14),
-    Node(7,10)
-]
-
-##### convert my outputs to this guys inputs
-
-# his
-gx = [0, 1, 2, 9, 9] # 5 desired waypoints
-gy = [0, 9, 5, 9, 2]
-
-gx = []
-gy = []
-
-# mine
-for node in nodes:
-    gx.append(node.x)
-    gy.append(node.y)
-
-# his
-sx = 0 # Starting point
-sy = 0
-
-# mine
-sx = nodes[0].x
-sy = nodes[0].y
-
-# his
-ox = [2, 3, 4, 4, 4, 4, 10, 9, 8, 7, 6, 6]
-oy = [7, 7, 7, 8, 9, 10, 5, 5, 5, 5, 5, 4]
-
-ox = []
-oy = []
-
-# mine
-for obstacle in scenario.obstacles.values():
-    ox.append(obstacle.x)
-    oy.append(obstacle.y)
-      
-# his
-grid_size = 0.5
-grid_x = 10
-grid_y = 10
-min_x = 0
-min_y = 0
-
-# mine
-grid_size = scenario.grid.grid_spacing
-grid_x = scenario.grid.max_x
-grid_y = scenario.grid.max_y
-min_x = scenario.grid.min_x
-min_y = scenario.grid.min_y
-
-# Plotting   
-plt.plot(ox, oy, ".b")
-plt.plot(sx, sy, "xg")
-plt.plot(gx, gy, "xr")
-plt.axis([min_x, grid_x, min_y, grid_y])
-# plt.show()
-
-# his
-cities = [0, 1, 2, 3, 4]
-
-# mine
-cities = list(range(1,len(nodes)))
-
-cost_matrix = np.zeros([len(gx), len(gx)])
-path_matrix = dict()
-
-for i, start in enumerate(nodes):
-    for j, goal in enumerate(nodes):
-        if i == j:
-            continue
-        scenario.algorithm.reset()
-        start.reset()
-        goal.reset()
-        scenario.algorithm.start = start
-        scenario.algorithm.goal = goal
-        scenario.algorithm.find_path()
-        path_matrix[i, j] = path_store(
-            [n.x for n in scenario.algorithm.path],
-            [n.y for n in scenario.algorithm.path],
-            scenario.algorithm.path[0].total_cost
-        )
-        cost_matrix[i, j] = scenario.algorithm.path[0].total_cost
-
-adjacency_mat = cost_matrix
-
 class Population():
     def __init__(self, bag, adjacency_mat):
-        self.bag = bag
+        self.bag = np.asarray(bag)  # one chromosome per row
         self.parents = []
         self.score = 0
         self.best = None
@@ -163,22 +38,21 @@ def init_population(cities, adjacency_mat, n_population):
         adjacency_mat
     )
 
-pop = init_population(cities, adjacency_mat, 5)
-
-def fitness(self, chromosome):
-    return (sum([
-        self.adjacency_mat[chromosome[i], chromosome[i + 1]]
-        for i in range(len(chromosome) - 1)]) 
-        + self.adjacency_mat[0, chromosome[0]])  # because we have to start at first node every time
+def fitness(self, bag):
+    # every leg of every chromosome in one fancy index, plus the leg from the
+    # first node because we have to start there every time
+    bag = np.atleast_2d(bag)
+    return (
+        self.adjacency_mat[bag[:, :-1], bag[:, 1:]].sum(axis=1)
+        + self.adjacency_mat[0, bag[:, 0]]
+    )
 
 Population.fitness = fitness
 
 def evaluate(self):
-    distances = np.asarray(
-        [self.fitness(chromosome) for chromosome in self.bag]
-    )
+    distances = self.fitness(self.bag)
     self.score = np.min(distances)
-    self.best = self.bag[distances.tolist().index(self.score)]
+    self.best = self.bag[np.argmin(distances)]
     self.parents.append(self.best)
     if False in (distances[0] == distances):
         distances = np.max(distances) - distances
@@ -186,13 +60,17 @@ def evaluate(self):
     
 Population.evaluate = evaluate
 
-def select(self, k=4):
+def select(self, k=4, method="roulette", tournament_size=3):
     fit = self.evaluate()
-    while len(self.parents) < k:
-        idx = np.random.randint(0, len(fit))
-        if fit[idx] > np.random.rand():
-            self.parents.append(self.bag[idx])
-    self.parents = np.asarray(self.parents)
+    count = max(int(k) - len(self.parents), 0)
+    if method == "tournament":
+        # best of tournament_size random chromosomes, for every parent at once
+        contestants = np.random.randint(0, len(fit), size=(count, tournament_size))
+        idx = contestants[np.arange(count), np.argmax(fit[contestants], axis=1)]
+    else:
+        # fitness proportional, fit already sums to 1
+        idx = np.random.choice(len(fit), size=count, p=fit)
+    self.parents = np.vstack([np.asarray(self.parents), self.bag[idx]])
 
 Population.select = select
 
@@ -205,29 +83,33 @@ def swap(chromosome):
     return chromosome
 
 def crossover(self, p_cross=0.1):
-    children = []
     count, size = self.parents.shape
-    for _ in range(len(self.bag)):
-        if np.random.rand() > p_cross:
-            children.append(
-                list(self.parents[np.random.randint(count, size=1)[0]])
-            )
-        else:
-            parent1, parent2 = self.parents[
-                np.random.randint(count, size=2), :
-            ]
-            idx = np.random.choice(range(size), size=2, replace=False)
-            start, end = min(idx), max(idx)
-            child = [None] * size
-            for i in range(start, end + 1, 1):
-                child[i] = parent1[i]
-            pointer = 0
-            for i in range(size):
-                if child[i] is None:
-                    while parent2[pointer] in child:
-                        pointer += 1
-                    child[i] = parent2[pointer]
-            children.append(child)
+    children = self.parents[np.random.randint(count, size=len(self.bag))]
+
+    # order crossover for the children that cross, all at once: keep a slice
+    # of parent1 and fill the rest in parent2's order, skipping the cities the
+    # slice already has, found with a city lookup array instead of a search
+    crossed = np.flatnonzero(np.random.rand(len(self.bag)) <= p_cross)
+    if len(crossed):
+        parent1 = children[crossed]
+        parent2 = self.parents[np.random.randint(count, size=len(crossed))]
+        # two distinct cut points per child
+        start = np.random.randint(size, size=len(crossed))
+        end = np.random.randint(size - 1, size=len(crossed))
+        end += end >= start
+        start, end = np.minimum(start, end), np.maximum(start, end)
+        positions = np.arange(size)
+        in_slice = (positions >= start[:, None]) & (positions <= end[:, None])
+
+        in_child = np.zeros((len(crossed), self.parents.max() + 1), dtype=bool)
+        in_child[np.nonzero(in_slice)[0], parent1[in_slice]] = True
+        from_parent2 = ~in_child[np.arange(len(crossed))[:, None], parent2]
+
+        child = np.empty_like(parent1)
+        child[in_slice] = parent1[in_slice]
+        child[~in_slice] = parent2[from_parent2]
+        children[crossed] = child
+
     return children
 
 Population.crossover = crossover
@@ -257,13 +139,18 @@ def genetic_algorithm(
     print_interval=100,
     return_history=False,
     verbose=False,
+    selection="roulette",
+    tournament_size=3,
+    local_search=None,
+    memetic_rate=0.05,
+    memetic_cap=1,
 ):
     pop = init_population(cities, adjacency_mat, n_population)
     best = pop.best
     score = float("inf")
     history = []
     for i in range(n_iter):
-        pop.select(n_population * selectivity)
+        pop.select(n_population * selectivity, selection, tournament_size)
         history.append(pop.score)
         if verbose:
             print(f"Generation {i}: {pop.score}")
@@ -272,35 +159,150 @@ def genetic_algorithm(
         if pop.score < score:
             best = pop.best
             score = pop.score
-        children = pop.mutate(p_cross, p_mut)
+        children = np.asarray(pop.mutate(p_cross, p_mut))
+        if local_search:
+            # memetic step, polish a share of the children with 2-opt/Or-opt,
+            # at most memetic_cap a generation so the step's cost stays flat,
+            # the paths start at the first node every time
+            polished = np.flatnonzero(np.random.rand(len(children)) < memetic_rate)
+            for j in polished[:memetic_cap]:
+                children[j] = local_search.improve([0] + children[j].tolist())[1:]
         pop = Population(children, pop.adjacency_mat)
     if return_history:
         return best, history
     return best
 
-scenario.algorithm.stopwatch.start()
-best = genetic_algorithm(cities, adjacency_mat, verbose=True)
-best.insert(0, 0)
-scenario.algorithm.stopwatch.stop()
-print(f"Time: {scenario.algorithm.stopwatch.elapsed_time}")
-
-for i, n in enumerate(best):
-    plt.text(nodes[n].x, nodes[n].y, str(i))
-
-# Plotting   
-plt.plot(ox, oy, ".b")
-plt.plot(sx, sy, "xg")
-plt.plot(gx, gy, "xr")
-plt.axis([min_x-grid_size, grid_x+grid_size, min_y-grid_size, grid_y+grid_size])
+def main():
+    # my_code...
+    scenario: Scenario = Scenario().loader(
+        #####  the naming structure for scenarios  #####
+        # "scenarios / SearchType _ grid-size _ bot-size _ grid-spacing.json"
+        # "scenarios/AStar_10x10_bot-0o5_grid-0o5.json"  --> -->
+        # "scenarios / AStar _ 10x10 grid _ bot radius 0.5 _ grid spacing 0.5"
+        # if 'random' is at the end, then random start/goal pos and/or obstacle pos
+        #####
+
+        #####  scenarios in the "scenarios" folder  #####
+        # "scenarios/AStar_10x10_bot-0o5_grid-0o5.json"
+        # "scenarios/AStar_10x10_bot-0o5_grid-0o5_random.json"
+        # "scenarios/AStar_15x15_bot-0o5_grid-0o5a.json"       # Exam2 Problem 3
+        "scenarios/AStar_15x15_bot-0o5_grid-0o5b.json"       # Exam2 Problem 4
+        # "scenarios/AStar_15x15_bot-0o5_grid-1o0.json"        # HW5 problem 1a
+        # "scenarios/AStar_50x50_bot-0o5_grid-0o5.json"        # HW3 problem 2
+        # "scenarios/AStar_50x50_bot-0o5_grid-0o5_random.json"
+        # "scenarios/Dijkstra_15x15_bot-0o5_grid-1o0.json"     # HW5 problem 1b
+        # "scenarios/RRT_10x10_bot-0o5_grid-0o5.json"
+        # "scenarios/RRT_10x10_bot-0o5_grid-0o5_random.json"
+        # "scenarios/RRT_15x15_bot-0o5_grid-1o0.json"          # HW5 problem 1c
+        # "scenarios/RRT_50x50_bot-0o5_grid-0o5.json"          # HW3 problem 3
+        #####
+    )
 
-for i in range(1,len(best)):
-    plt.plot(path_matrix[best[i-1],best[i]].x,path_matrix[best[i-1],best[i]].y,'r-')
-#plt.plot(pathx, pathy, "-r")
-plt.xlabel('X Distance')
-plt.ylabel('Y Distance')
-plt.show()
+    nodes = [
+        Node(1,1),
+        Node(9,7),
+        Node(1,9),
+        Node(4,4),
+        Node(9,4),
+        Node(6,14),
+        Node(3,11),
+        Node(14,1),
+        Node(1,14),
+        Node(14,14),
+        Node(7,10)
+    ]
+
+    ##### convert my outputs to this guys inputs
+
+    # his
+    gx = [0, 1, 2, 9, 9] # 5 desired waypoints
+    gy = [0, 9, 5, 9, 2]
+
+    gx = []
+    gy = []
+
+    # mine
+    for node in nodes:
+        gx.append(node.x)
+        gy.append(node.y)
+
+    # his
+    sx = 0 # Starting point
+    sy = 0
+
+    # mine
+    sx = nodes[0].x
+    sy = nodes[0].y
+
+    # his
+    ox = [2, 3, 4, 4, 4, 4, 10, 9, 8, 7, 6, 6]
+    oy = [7, 7, 7, 8, 9, 10, 5, 5, 5, 5, 5, 4]
+
+    ox = []
+    oy = []
+
+    # mine
+    for obstacle in scenario.obstacles.values():
+        ox.append(obstacle.x)
+        oy.append(obstacle.y)
+
+    # his
+    grid_size = 0.5
+    grid_x = 10
+    grid_y = 10
+    min_x = 0
+    min_y = 0
+
+    # mine
+    grid_size = scenario.grid.grid_spacing
+    grid_x = scenario.grid.max_x
+    grid_y = scenario.grid.max_y
+    min_x = scenario.grid.min_x
+    min_y = scenario.grid.min_y
+
+    # Plotting   
+    plt.plot(ox, oy, ".b")
+    plt.plot(sx, sy, "xg")
+    plt.plot(gx, gy, "xr")
+    plt.axis([min_x, grid_x, min_y, grid_y])
+    # plt.show()
+
+    # his
+    cities = [0, 1, 2, 3, 4]
+
+    # mine
+    cities = list(range(1,len(nodes)))
+
+    # one Dijkstra tree per waypoint over a process pool instead of an A* search
+    # per ordered pair, path_matrix[i, j] has the path's x, y and cost
+    cost_matrix, path_matrix = CostMatrix(scenario.grid, nodes).build()
+
+    adjacency_mat = cost_matrix
+
+    scenario.algorithm.stopwatch.start()
+    best = genetic_algorithm(
+        cities, adjacency_mat, verbose=True, local_search=LocalSearch(adjacency_mat)
+    )
+    best = [0] + best.tolist()
+    scenario.algorithm.stopwatch.stop()
+    print(f"Time: {scenario.algorithm.stopwatch.elapsed_time}")
 
+    for i, n in enumerate(best):
+        plt.text(nodes[n].x, nodes[n].y, str(i))
 
+    # Plotting   
+    plt.plot(ox, oy, ".b")
+    plt.plot(sx, sy, "xg")
+    plt.plot(gx, gy, "xr")
+    plt.axis([min_x-grid_size, grid_x+grid_size, min_y-grid_size, grid_y+grid_size])
 
+    for i in range(1,len(best)):
+        plt.plot(path_matrix[best[i-1],best[i]].x,path_matrix[best[i-1],best[i]].y,'r-')
+    #plt.plot(pathx, pathy, "-r")
+    plt.xlabel('X Distance')
+    plt.ylabel('Y Distance')
+    plt.show()
 
 
+if __name__ == "__main__":
+    main()
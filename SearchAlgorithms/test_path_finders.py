@@ -0,0 +1,139 @@
+from __future__ import annotations
+import json
+import random
+
+import pytest
+
+from ArrayAStar import ArrayAStar
+from AStar import AStar
+from BidirectionalAStar import BidirectionalAStar
+from DStarLite import DStarLite
+from Grid import Grid
+from JumpPointSearch import JumpPointSearch
+from Node import Node
+from PathFinder import PathFinder
+from Scenario import Scenario
+
+# planners that promise AStar's path costs
+PATH_FINDERS: list[type[PathFinder]] = [
+    ArrayAStar, BidirectionalAStar, JumpPointSearch, DStarLite
+]
+
+SCENARIOS: list[str] = [
+    "scenarios/AStar_10x10_bot-0o5_grid-0o5.json",
+    "scenarios/AStar_15x15_bot-0o5_grid-1o0.json",
+]
+
+def path_cost(
+    path_finder_type: type[PathFinder],
+    grid: Grid,
+    start: tuple[float, float],
+    goal: tuple[float, float]
+) -> float:
+    """
+    Cost of the planner's path, checked to run goal to start and to add up
+    along its legs, None if there is no path
+    """
+    path_finder: PathFinder = path_finder_type(
+        start=Node(*start), goal=Node(*goal), grid=grid
+    )
+    try:
+        path_finder.find_path()
+    except ValueError:
+        return None
+
+    path: list[Node] = path_finder.path
+    assert path[0] == Node(*goal)
+    assert path[-1] == Node(*start)
+    assert sum(
+        node.distance_to(parent) for node, parent in zip(path, path[1:])
+    ) == pytest.approx(path[0].total_cost)
+    return path[0].total_cost
+
+def queries(grid: Grid, count: int) -> list[tuple[tuple[float, float], ...]]:
+    """
+    Random off-lattice queries, then same cell, on lattice and out of bounds
+    ones
+    """
+    rng: random.Random = random.Random(5)
+    x_range: tuple[float, float] = (grid.min_x, grid.max_x)
+    y_range: tuple[float, float] = (grid.min_y, grid.max_y)
+    random_queries: list[tuple[tuple[float, float], ...]] = [
+        (
+            (rng.uniform(*x_range), rng.uniform(*y_range)),
+            (rng.uniform(*x_range), rng.uniform(*y_range))
+        )
+        for _ in range(count)
+    ]
+    return random_queries + [
+        ((1.1, 1.2), (1.2, 1.1)),
+        ((2.0, 2.0), (2.0, 2.0)),
+        ((2.0, 2.0), (8.0, 8.0)),
+        ((5.0, -3.0), (4.0, 9.0)),
+        ((4.0, 9.0), (5.0, -3.0)),
+        ((30.0, 5.0), (4.0, 9.0)),
+    ]
+
+@pytest.mark.parametrize("path_finder_type", PATH_FINDERS)
+@pytest.mark.parametrize("scenario_file", SCENARIOS)
+def test_matches_astar_costs(
+    path_finder_type: type[PathFinder], scenario_file: str
+) -> None:
+    grid: Grid = Scenario().loader(scenario_file).grid
+    for start, goal in queries(grid, 100):
+        expected: float = path_cost(AStar, grid, start, goal)
+        cost: float = path_cost(path_finder_type, grid, start, goal)
+        if expected is None:
+            assert cost is None, (start, goal)
+        else:
+            assert cost == pytest.approx(expected), (start, goal)
+
+@pytest.mark.parametrize("seed", range(10))
+def test_dstarlite_replans_match_astar(seed: int, tmp_path) -> None:
+    scenario_file = tmp_path / "scenario.json"
+    scenario_file.write_text(json.dumps({
+        "bot_radius": 0.49,
+        "grid": {
+            "min_x": 0, "max_x": 20, "min_y": 0, "max_y": 20,
+            "grid_spacing": 0.5
+        },
+        "obstacles": {"count": 60, "radius": "random(0.01, 1)"},
+        "start": {"x": 20, "y": 19.5},
+        "goal": {"x": 11, "y": 0.5},
+        "algorithm": {"type": "AStar", "params": {}},
+        "seed": seed
+    }))
+    grid: Grid = Scenario().loader(str(scenario_file)).grid
+    goal: Node = Node(11, 0.5)
+    d_star_lite: DStarLite = DStarLite(start=Node(20, 19.5), goal=goal, grid=grid)
+
+    # step along the path, blocking or freeing cells near it after each step
+    rng: random.Random = random.Random(seed)
+    for _ in range(25):
+        start: tuple[float, float] = (d_star_lite.start.x, d_star_lite.start.y)
+        expected: float = path_cost(AStar, grid, start, (goal.x, goal.y))
+        try:
+            d_star_lite.find_path()
+        except ValueError:
+            assert expected is None
+            break
+
+        path: list[Node] = d_star_lite.path
+        assert path[0].total_cost == pytest.approx(expected)
+        assert path[0].total_cost == pytest.approx(d_star_lite.start_cost())
+        assert sum(
+            node.distance_to(parent) for node, parent in zip(path, path[1:])
+        ) == pytest.approx(path[0].total_cost)
+
+        if len(path) > 3:
+            d_star_lite.start = Node(path[-2].x, path[-2].y)
+        path_cells: list[tuple[int, int]] = [
+            grid.cell_of(node) for node in path[1:-1]
+        ]
+        changed: list[tuple[int, int]] = []
+        for _ in range(3):
+            cell: tuple[int, int] = rng.choice(path_cells)
+            cell = (cell[0] + rng.randint(-2, 2), cell[1] + rng.randint(-2, 2))
+            if cell not in (grid.cell_of(d_star_lite.start), grid.cell_of(goal)):
+                changed.append(cell)
+        grid.set_cells_blocked(changed, rng.random() < 0.8)